@@ -0,0 +1,394 @@
+# adaptive_priority_queue.py
+#
+# Coda di priorità ADATTIVA: sceglie a run-time la rappresentazione
+# più conveniente tra le tre implementazioni disponibili.
+#
+# Le tre strutture hanno profili di costo opposti:
+#   - LinkedListPriorityQueue       : insert O(1),  extract_max O(n)
+#   - SortedLinkedListPriorityQueue : insert O(n),  extract_max O(1)
+#   - HeapPriorityQueue             : insert O(log n), extract_max O(log n)
+#
+# La coda osserva le ultime 'window' operazioni (quante insert, extract_max
+# e peek) e, alla fine di ogni finestra, stima con un semplice modello di
+# costo quanto costerebbe continuare con ciascuna rappresentazione.
+# Migra il contenuto solo se il risparmio previsto supera il costo della
+# conversione (O(n)), andata e ritorno.
+#
+# Le insert non vengono contate una per una: sono la differenza tra la
+# dimensione alla fine e all'inizio della finestra, più le estrazioni.
+# Così sull'heap insert è direttamente il metodo della rappresentazione
+# interna, senza alcun costo aggiuntivo, e la finestra avanza solo con
+# extract_max e peek (una fase di sole insert non ha motivo di lasciare
+# l'heap: la lista non ordinata risparmierebbe poco). Sulle liste insert
+# passa dalla coda adattiva, che non espone i nodi restituiti dalla lista
+# non ordinata; sulla lista ordinata, dove una fase di insert va
+# riconosciuta perché costa O(n) per operazione, fa anche avanzare la
+# finestra.
+#
+# Si parte dalla lista non ordinata, che fa da "buffer" per le insert.
+# Una extract_max/peek sulla lista costerebbe O(n): alla prima il buffer
+# viene convertito subito, senza aspettare la fine della finestra, in un
+# heap (costruzione bottom-up O(n)). La lista ordinata, con estrazioni O(1),
+# viene scelta al suo posto solo se la fase di estrazione precedente fa
+# prevedere uno svuotamento abbastanza lungo da ripagare anche il ritorno
+# alla lista; finché non si è osservata nessuna fase di estrazione la durata
+# è ignota e si sceglie l'heap, che assorbe qualsiasi mix di operazioni.
+#
+# L'orizzonte su cui valutare il risparmio è pari alla durata osservata della
+# fase (numero di finestre consecutive che indicano la stessa rappresentazione,
+# moltiplicato per 'lookahead'): una fase lunga e stabile giustifica
+# conversioni più costose.
+#
+# Ambito: la coda adattiva sceglie solo tra le sue tre rappresentazioni e
+# non può battere l'heap quando l'heap è già la scelta migliore per quasi
+# tutta la traccia (tracce miste, brevi raffiche di estrazioni): paga
+# l'osservazione delle operazioni e le conversioni di prova, e resta entro
+# il 10-25% circa dall'heap. Guadagna sulle fasi di solo caricamento seguite
+# da uno svuotamento (buffer + heapify), tanto più quanto più la coda è
+# grande. Rispetto alle liste resta sempre molto più veloce; le code basate
+# su funzioni in C (heapq, bisect.insort) sono fuori dalla sua portata
+# (vedi bench_adaptive in benchmarks.py).
+
+
+import math
+
+from priority_queue_base import PriorityQueue, _NO_ITEM
+from snapshot import check_keys_only, write_snapshot, read_snapshot
+from heap_priority_queue import HeapPriorityQueue
+from linked_list_priority_queue import LinkedListPriorityQueue
+from sorted_linked_list_priority_queue import SortedLinkedListPriorityQueue
+
+
+# Rappresentazioni disponibili: nome → classe
+REPRESENTATIONS = {
+    "linked_list": LinkedListPriorityQueue,
+    "sorted_linked_list": SortedLinkedListPriorityQueue,
+    "heap": HeapPriorityQueue,
+}
+
+# Indici dei contatori delle operazioni
+_EXTRACT, _PEEK = 0, 1
+
+
+def _entries_of(pq):
+    """
+    Restituisce (keys, items): le priorità e gli item contenuti in una
+    delle tre rappresentazioni, in un ordine in cui gli elementi con la
+    stessa priorità compaiono nell'ordine di inserimento (così from_keys
+    conserva l'ordine FIFO).
+
+    Complessità: O(n) per le liste, O(n log n) per l'heap
+    (ordinamento per numero di inserimento, eseguito in C).
+    """
+    if isinstance(pq, HeapPriorityQueue):
+        # Gli elementi cancellati in modo pigro (tombstone) vengono esclusi
+        removed = pq._removed
+        order = sorted((i for i, s in enumerate(pq.seqs) if s not in removed),
+                       key=pq.seqs.__getitem__)
+        return [pq.data[i] for i in order], [pq.items[i] for i in order]
+
+    keys = []
+    items = []
+    current = pq.head
+    while current is not None:
+        keys.append(current.key)
+        items.append(current.item)
+        current = current.next
+
+    # Nella lista non ordinata la testa è l'elemento più recente
+    if isinstance(pq, LinkedListPriorityQueue):
+        keys.reverse()
+        items.reverse()
+    return keys, items
+
+
+def estimate_cost(mode, n, inserts, extracts, peeks):
+    """
+    Stima il costo di eseguire il mix di operazioni indicato su una coda
+    di dimensione n.
+
+    L'unità di misura è il costo di un passo di scansione della lista
+    (circa 40 ns in CPython 3.11); le costanti sono state ricavate
+    misurando le singole operazioni con chiavi casuali, per n da 300 a
+    20000 (heap con array paralleli e handle opzionali):
+    - lista non ordinata: insert 15, extract n, peek n (scansione completa)
+    - lista ordinata:     insert 15 + n/2 (scansione media), extract 5, peek 2
+    - heap:               insert 25, extract 8 per livello, peek 4
+    """
+    if mode == "linked_list":
+        return inserts * 15 + (extracts + peeks) * n
+    if mode == "sorted_linked_list":
+        return inserts * (15 + n / 2) + extracts * 5 + peeks * 2
+    lg = math.log2(n + 1) + 1
+    return inserts * 25 + extracts * 8 * lg + peeks * 4
+
+
+# Costo per elemento della costruzione di ciascuna rappresentazione
+# (from_keys), nella stessa unità di estimate_cost.
+_BUILD_COST = {
+    "linked_list": 10,
+    "sorted_linked_list": 16,
+    "heap": 10,
+}
+
+# Costo per elemento della raccolta del contenuto (_entries_of): una
+# passata sulle liste; per l'heap anche l'ordinamento per seq.
+_COLLECT_COST = {
+    "linked_list": 1.5,
+    "sorted_linked_list": 1.5,
+    "heap": 7,
+}
+
+
+# Costo fisso di una migrazione (chiamate, allocazione della nuova coda):
+# evita conversioni continue quando la coda è quasi vuota.
+_MIGRATION_OVERHEAD = 200
+
+
+def conversion_cost(source, mode, n):
+    """
+    Costo stimato di una migrazione da 'source' a 'mode': la raccolta
+    delle chiavi dalla rappresentazione corrente più la costruzione.
+    """
+    return (_COLLECT_COST[source] + _BUILD_COST[mode]) * n + _MIGRATION_OVERHEAD
+
+
+class AdaptivePriorityQueue(PriorityQueue):
+
+    def __init__(self, window=64, lookahead=1, initial="linked_list", key=None):
+        """
+        Parametri:
+        - window:    numero di operazioni osservate prima di ogni decisione
+                     (sull'heap solo extract_max e peek)
+        - lookahead: per quante volte la sua durata osservata si assume che
+                     la fase corrente continui (maggiore → migra più
+                     facilmente)
+        - initial:   rappresentazione iniziale (chiave di REPRESENTATIONS)
+        - key:       funzione opzionale per calcolare la priorità; viene
+                     applicata qui, le rappresentazioni interne ricevono
+                     sempre coppie (priorità, item)
+        """
+        if initial not in REPRESENTATIONS:
+            raise ValueError("initial must be one of " + ", ".join(REPRESENTATIONS))
+
+        super().__init__(key)
+        self.window = window
+        self.lookahead = lookahead
+        self.mode = initial
+        self.backend = REPRESENTATIONS[initial]()
+        self._bind()
+
+        # Contatori della finestra corrente: [extract, peek], operazioni che
+        # mancano alla fine della finestra e dimensione al suo inizio
+        self._counts = [0, 0]
+        self._left = window
+        self._size0 = 0
+
+        # Estrazioni delle finestre concluse dall'ultima conversione del
+        # buffer: con quelle della finestra corrente danno la durata
+        # dell'ultima fase di estrazione (vedi _lazy_convert).
+        # None finché non è iniziata nessuna fase di estrazione.
+        self._drained = None
+
+        # Rappresentazione migliore nelle ultime finestre e per quante
+        # finestre consecutive è rimasta tale
+        self._candidate = initial
+        self._streak = 0
+
+        # Numero di migrazioni effettuate (utile nei benchmark)
+        self.migrations = 0
+
+    def size(self):
+        """Restituisce il numero di elementi presenti nella coda."""
+        return self.backend.size()
+
+    # insert, peek ed extract_max aggiornano i contatori della finestra in
+    # linea, senza un metodo comune, e chiamano i metodi della
+    # rappresentazione interna già legati da _bind: il costo fisso per
+    # operazione della coda adattiva si somma a ogni operazione della
+    # rappresentazione interna, quindi va tenuto al minimo.
+
+    def insert(self, key, item=_NO_ITEM):
+        """
+        Inserisce l'elemento nella rappresentazione corrente.
+        Senza funzione key, (key, item) viene passato così com'è: la
+        rappresentazione interna applica le stesse regole di _entry.
+        Sull'heap senza funzione key _bind sostituisce insert con il metodo
+        della rappresentazione.
+        """
+        if self.keyfunc is not None:
+            key, item = self._entry(key, item)
+        self._insert(key, item)
+        self._left -= 1
+        if self._left <= 0:
+            self._adapt()
+
+    def remove(self, key_or_handle):
+        """
+        Rimuove un elemento il cui item è uguale alla chiave, delegando
+        alla rappresentazione corrente. Gli handle delle rappresentazioni
+        interne non vengono esposti (una migrazione li invaliderebbe),
+        quindi la rimozione è sempre per chiave.
+        """
+        self.backend.remove(key_or_handle)
+
+    def dump(self, fileobj):
+        """
+        Salva le chiavi in un ordine indipendente dalla rappresentazione
+        corrente (quello di _entries_of). O(n) (O(n log n) dall'heap)
+        """
+        keys, items = _entries_of(self.backend)
+        check_keys_only(keys, items, self.keyfunc)
+        write_snapshot(fileobj, keys)
+
+    @classmethod
+    def load(cls, fileobj):
+        """
+        Ricostruisce la coda con i parametri predefiniti, costruendo la
+        rappresentazione iniziale con from_keys. O(n)
+        """
+        keys, _ = read_snapshot(fileobj)
+        pq = cls()
+        pq.backend = REPRESENTATIONS[pq.mode].from_keys(keys)
+        pq._bind()
+        pq._size0 = len(keys)
+        return pq
+
+    def peek(self):
+        """Restituisce il massimo senza rimuoverlo."""
+        result = self._peek()
+        self._counts[_PEEK] += 1
+        self._left -= 1
+        if self._left <= 0:
+            self._adapt()
+        return result
+
+    def extract_max(self):
+        """Rimuove e restituisce il massimo."""
+        result = self._extract_max()
+        self._counts[_EXTRACT] += 1
+        self._left -= 1
+        if self._left <= 0:
+            self._adapt()
+        return result
+
+    # -------------------------------------------------------------------
+    # METODI INTERNI (helper)
+    # -------------------------------------------------------------------
+
+    def _bind(self):
+        """
+        Lega i metodi della rappresentazione corrente, chiamati a ogni
+        operazione. Sull'heap (senza funzione key) insert diventa il suo
+        metodo; sulla lista non ordinata peek ed extract_max passano prima
+        da _lazy_convert.
+        """
+        backend = self.backend
+        self._insert = backend.insert
+        if self.mode == "heap" and self.keyfunc is None:
+            self.insert = backend.insert
+        else:
+            self.__dict__.pop("insert", None)
+        if self.mode == "linked_list":
+            self._peek = self._lazy_peek
+            self._extract_max = self._lazy_extract_max
+        else:
+            self._peek = backend.peek
+            self._extract_max = backend.extract_max
+
+    def _lazy_peek(self):
+        self._lazy_convert()
+        return self.backend.peek()
+
+    def _lazy_extract_max(self):
+        self._lazy_convert()
+        return self.backend.extract_max()
+
+    def _lazy_convert(self):
+        """
+        Chiamata prima di una peek/extract_max sulla lista non ordinata:
+        invece di scandire la lista (O(n) a ogni estrazione), converte
+        subito il buffer per la fase di estrazione che sta iniziando.
+
+        Si sceglie l'heap, che assorbe le insert in O(log n) e resta, a meno
+        che la lista ordinata (estrazioni O(1)) non faccia risparmiare più
+        del suo ritorno: se dopo h estrazioni ricominciano le insert, va
+        riconvertita in lista dopo una finestra di insert in O(n) (quella
+        che serve ad accorgersi del cambio di fase).
+        La durata prevista h è quella della fase di estrazione precedente;
+        se non se n'è ancora osservata una è ignota e si sceglie l'heap.
+        """
+        n = self.backend.size()
+        mode = "heap"
+        if self._drained is not None:
+            h = min(n, self._drained + self._counts[_EXTRACT])
+            saving = (conversion_cost("linked_list", "heap", n)
+                      + estimate_cost("heap", n, 0, h, 0)
+                      - conversion_cost("linked_list", "sorted_linked_list", n)
+                      - estimate_cost("sorted_linked_list", n, 0, h, 0))
+            back = 0
+            if h < n:
+                back = (estimate_cost("sorted_linked_list", n - h, self.window, 0, 0)
+                        + conversion_cost("sorted_linked_list", "linked_list", n - h))
+            if saving > back:
+                mode = "sorted_linked_list"
+
+        self._migrate(mode)
+        # la fase di estrazione che inizia conta da qui
+        self._drained = -self._counts[_EXTRACT]
+
+    def _adapt(self):
+        """
+        Chiamata alla fine di ogni finestra (azzera i contatori).
+        Confronta il costo stimato delle tre rappresentazioni sul mix di
+        operazioni della finestra appena conclusa e migra se il risparmio
+        atteso ripaga la conversione. L'orizzonte è di 'lookahead' finestre
+        per ogni finestra consecutiva in cui 'best' è rimasta la stessa.
+
+        Il risparmio deve coprire sia l'andata sia l'eventuale ritorno alla
+        rappresentazione corrente: le fasi finiscono, e una conversione che
+        si ripaga solo se la fase dura per sempre porta a oscillare
+        (con le brevi raffiche di estrazioni, ad esempio).
+        """
+        n = self.backend.size()
+        extracts, peeks = self._counts
+        # remove può far sottostimare le insert, mai sotto zero
+        inserts = max(0, n - self._size0 + extracts)
+        self._counts = [0, 0]
+        self._left = self.window
+        self._size0 = n
+        if self._drained is not None:
+            self._drained += extracts
+
+        costs = {
+            mode: estimate_cost(mode, n, inserts, extracts, peeks)
+            for mode in REPRESENTATIONS
+        }
+        best = min(costs, key=costs.get)
+
+        if best == self._candidate:
+            self._streak += 1
+        else:
+            self._candidate = best
+            self._streak = 1
+
+        if best == self.mode:
+            return
+
+        # La lista ordinata paga anche la finestra di insert O(n) che serve
+        # ad accorgersi della fine della fase (come in _lazy_convert)
+        round_trip = conversion_cost(self.mode, best, n) + conversion_cost(best, self.mode, n)
+        if best == "sorted_linked_list":
+            round_trip += estimate_cost(best, n, self.window, 0, 0)
+
+        saving = (costs[self.mode] - costs[best]) * self.lookahead * self._streak
+        if saving > round_trip:
+            self._migrate(best)
+
+    def _migrate(self, mode):
+        """Trasferisce tutto il contenuto nella rappresentazione 'mode'."""
+        keys, items = _entries_of(self.backend)
+        self.backend = REPRESENTATIONS[mode].from_keys(keys, items)
+        self.mode = mode
+        self._bind()
+        self.migrations += 1
@@ -0,0 +1,349 @@
+# analysis.py
+#
+# Analisi empirica della complessità a partire dai risultati aggregati
+# (aggregated_results.csv) prodotti da tests.py.
+#
+# Per ogni terna (operazione, caso, implementazione):
+#   - stima la pendenza in scala log-log:  log t = a + b·log n
+#     (b ≈ 1 → lineare, b ≈ 2 → quadratica) con intervallo di confidenza al 95%
+#   - sceglie il modello di crescita migliore tra n, n log n, n²
+#     (t ≈ c·f(n), stimato in scala logaritmica) con bande di confidenza su c
+#   - calcola i punti di incrocio (crossover): il valore di n oltre il quale
+#     un'implementazione diventa più veloce di un'altra
+#
+# Il CSV viene letto e indicizzato UNA SOLA VOLTA: tutte le analisi (e i
+# grafici in plot_results.py) lavorano sull'indice.
+#
+# Il modulo usa solo la libreria standard, così l'analisi può essere
+# eseguita anche dove matplotlib non è installato.
+
+
+import os
+import csv
+import math
+import argparse
+from itertools import combinations
+
+
+# Modelli di crescita candidati: nome → f(n)
+MODELS = {
+    "n": lambda n: n,
+    "n log n": lambda n: n * math.log2(n),
+    "n^2": lambda n: n * n,
+}
+
+# Quantili t di Student (a due code, 95%) per pochi gradi di libertà.
+# Oltre la tabella si usa l'approssimazione normale 1.96.
+_T95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571,
+    6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228,
+    12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060, 30: 2.042,
+}
+
+
+def t_quantile(df):
+    """
+    Restituisce il quantile t al 95% (due code) per 'df' gradi di libertà.
+    Per valori non in tabella usa il primo df tabulato inferiore
+    (stima conservativa); oltre 30 usa 1.96.
+    """
+    if df <= 0:
+        return float("inf")
+    if df > 30:
+        return 1.96
+    best = max(d for d in _T95 if d <= df)
+    return _T95[best]
+
+
+def index_aggregated(rows):
+    """
+    Costruisce l'indice dei risultati aggregati.
+
+    rows: lista di dizionari come restituiti da csv.DictReader
+          (vedi plot_results.read_aggregated)
+
+    Restituisce un dizionario:
+        (operation, case, impl) → (ns, medians)
+    dove 'ns' è ordinata in modo crescente e 'medians' contiene i
+    corrispondenti tempi mediani in secondi.
+
+    Complessità: O(r log r) con r = numero di righe (un solo ordinamento).
+    """
+    index = {}
+    for r in rows:
+        if r["median_s"] in ("", "None"):
+            continue
+        key = (r["operation"], r["case"], r["impl"])
+        index.setdefault(key, []).append((int(r["n"]), float(r["median_s"])))
+
+    result = {}
+    for key, points in index.items():
+        points.sort()
+        result[key] = ([p[0] for p in points], [p[1] for p in points])
+    return result
+
+
+def _positive_points(ns, ts):
+    """Scarta i punti con n <= 1 o tempo <= 0 (il logaritmo non è definito)."""
+    return [(n, t) for n, t in zip(ns, ts) if n > 1 and t > 0]
+
+
+def fit_loglog(ns, ts):
+    """
+    Regressione lineare ai minimi quadrati in scala log-log:
+        log t = a + b·log n
+
+    Restituisce un dizionario:
+        {
+            "slope": b,
+            "intercept": a,
+            "slope_ci": semi-ampiezza dell'intervallo al 95% su b,
+            "r2": coefficiente di determinazione,
+            "points": numero di punti usati
+        }
+    oppure None se ci sono meno di due punti utilizzabili.
+
+    Con due soli punti la retta passa esattamente per entrambi e
+    l'intervallo di confidenza è infinito.
+    """
+    points = _positive_points(ns, ts)
+    k = len(points)
+    if k < 2:
+        return None
+
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(t) for _, t in points]
+    mx = sum(xs) / k
+    my = sum(ys) / k
+    sxx = sum((x - mx) ** 2 for x in xs)
+    if sxx == 0:
+        return None
+    sxy = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+
+    slope = sxy / sxx
+    intercept = my - slope * mx
+
+    residuals = [y - (intercept + slope * x) for x, y in zip(xs, ys)]
+    rss = sum(e * e for e in residuals)
+    tss = sum((y - my) ** 2 for y in ys)
+    r2 = 1.0 - rss / tss if tss > 0 else 1.0
+
+    if k > 2:
+        se = math.sqrt(rss / (k - 2) / sxx)
+        slope_ci = t_quantile(k - 2) * se
+    else:
+        slope_ci = float("inf")
+
+    return {
+        "slope": slope,
+        "intercept": intercept,
+        "slope_ci": slope_ci,
+        "r2": r2,
+        "points": k,
+    }
+
+
+def fit_model(ns, ts, model):
+    """
+    Stima la costante c del modello t ≈ c·f(n), con f = MODELS[model].
+
+    La stima è fatta in scala logaritmica (errore relativo), così i punti
+    con n piccolo contano quanto quelli con n grande:
+        log c = media(log t - log f(n))
+
+    Restituisce un dizionario:
+        {
+            "model": nome del modello,
+            "c": stima di c,
+            "c_low", "c_high": intervallo di confidenza al 95% su c,
+            "rss": somma dei quadrati dei residui (scala log)
+        }
+    oppure None se non ci sono punti utilizzabili.
+    """
+    f = MODELS[model]
+    points = _positive_points(ns, ts)
+    k = len(points)
+    if k == 0:
+        return None
+
+    logs = [math.log(t) - math.log(f(n)) for n, t in points]
+    log_c = sum(logs) / k
+    rss = sum((v - log_c) ** 2 for v in logs)
+
+    if k > 1:
+        half = t_quantile(k - 1) * math.sqrt(rss / (k - 1) / k)
+    else:
+        half = float("inf")
+
+    return {
+        "model": model,
+        "c": math.exp(log_c),
+        "c_low": math.exp(log_c - half) if half != float("inf") else 0.0,
+        "c_high": math.exp(log_c + half) if half != float("inf") else float("inf"),
+        "rss": rss,
+    }
+
+
+def best_model(ns, ts):
+    """
+    Tra i modelli in MODELS sceglie quello con RSS minima (scala log).
+    Restituisce il dizionario di fit_model, oppure None.
+    """
+    best = None
+    for model in MODELS:
+        fit = fit_model(ns, ts, model)
+        if fit is not None and (best is None or fit["rss"] < best["rss"]):
+            best = fit
+    return best
+
+
+def crossover(fit_a, fit_b):
+    """
+    Calcola il punto di incrocio tra due rette log-log (vedi fit_loglog):
+        a1 + b1·log n = a2 + b2·log n  →  n* = exp((a2 - a1) / (b1 - b2))
+
+    Restituisce n* (float) oppure None se le rette sono parallele.
+    Per n > n* è più veloce l'implementazione con la pendenza minore.
+    """
+    db = fit_a["slope"] - fit_b["slope"]
+    if db == 0:
+        return None
+    exponent = (fit_b["intercept"] - fit_a["intercept"]) / db
+    # Evita overflow per rette quasi parallele
+    if exponent > 700:
+        return float("inf")
+    return math.exp(exponent)
+
+
+def analyze(index):
+    """
+    Esegue il fit su ogni serie dell'indice.
+
+    Restituisce un dizionario:
+        (operation, case, impl) → {"loglog": ..., "best": ...}
+    Le serie con meno di due punti vengono ignorate.
+    """
+    fits = {}
+    for key, (ns, ts) in index.items():
+        loglog = fit_loglog(ns, ts)
+        if loglog is None:
+            continue
+        fits[key] = {"loglog": loglog, "best": best_model(ns, ts)}
+    return fits
+
+
+def find_crossovers(index, fits):
+    """
+    Per ogni coppia di implementazioni con la stessa (operation, case)
+    calcola il crossover n*.
+
+    Restituisce una lista di dizionari:
+        {
+            "operation", "case", "impl_a", "impl_b",
+            "crossover_n": n* (None se le rette sono parallele),
+            "faster_after": implementazione più veloce per n > n*,
+            "in_range": True se n* cade nell'intervallo di n misurato
+        }
+    """
+    groups = {}
+    for (operation, case, impl) in fits:
+        groups.setdefault((operation, case), []).append(impl)
+
+    result = []
+    for (operation, case), impls in sorted(groups.items()):
+        for a, b in combinations(sorted(impls), 2):
+            fa = fits[(operation, case, a)]["loglog"]
+            fb = fits[(operation, case, b)]["loglog"]
+            n_star = crossover(fa, fb)
+
+            ns = index[(operation, case, a)][0] + index[(operation, case, b)][0]
+            faster = a if fa["slope"] < fb["slope"] else b
+
+            result.append({
+                "operation": operation,
+                "case": case,
+                "impl_a": a,
+                "impl_b": b,
+                "crossover_n": n_star,
+                "faster_after": faster,
+                "in_range": n_star is not None and min(ns) <= n_star <= max(ns),
+            })
+    return result
+
+
+def write_summary(fits, path):
+    """
+    Scrive la tabella riassuntiva dei fit in formato CSV:
+        impl, operation, case, slope, slope_ci, r2, points,
+        best_model, c, c_low, c_high
+    """
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            "impl", "operation", "case",
+            "slope", "slope_ci", "r2", "points",
+            "best_model", "c", "c_low", "c_high"
+        ])
+        for (operation, case, impl), fit in sorted(fits.items()):
+            ll = fit["loglog"]
+            best = fit["best"]
+            writer.writerow([
+                impl, operation, case,
+                ll["slope"], ll["slope_ci"], ll["r2"], ll["points"],
+                best["model"], best["c"], best["c_low"], best["c_high"]
+            ])
+
+
+def write_crossovers(crossovers, path):
+    """Scrive la tabella dei crossover in formato CSV."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            "operation", "case", "impl_a", "impl_b",
+            "crossover_n", "faster_after", "in_range"
+        ])
+        for c in crossovers:
+            writer.writerow([
+                c["operation"], c["case"], c["impl_a"], c["impl_b"],
+                c["crossover_n"], c["faster_after"], c["in_range"]
+            ])
+
+
+def read_index(agg_csv):
+    """Legge aggregated_results.csv e ne restituisce l'indice."""
+    with open(agg_csv, newline="") as f:
+        return index_aggregated(list(csv.DictReader(f)))
+
+
+def main(agg_csv="results/aggregated_results.csv", out_dir="results"):
+    """
+    Funzione principale:
+    - legge e indicizza il CSV aggregato
+    - calcola i fit e i crossover
+    - salva fit_summary.csv e crossovers.csv in 'out_dir'
+
+    Restituisce (index, fits) per poterli riusare (es. nei grafici).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    index = read_index(agg_csv)
+    fits = analyze(index)
+    crossovers = find_crossovers(index, fits)
+
+    summary_path = os.path.join(out_dir, "fit_summary.csv")
+    cross_path = os.path.join(out_dir, "crossovers.csv")
+    write_summary(fits, summary_path)
+    write_crossovers(crossovers, cross_path)
+
+    print("Fit summary saved to:", summary_path)
+    print("Crossovers saved to:", cross_path)
+    return index, fits
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit empirical complexity of priority queues.")
+    parser.add_argument("--agg", default="results/aggregated_results.csv", help="aggregated CSV")
+    parser.add_argument("--out", default="results", help="output directory")
+    args = parser.parse_args()
+
+    main(agg_csv=args.agg, out_dir=args.out)
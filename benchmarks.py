@@ -0,0 +1,1076 @@
+# benchmarks.py
+#
+# Benchmark aggiuntivi, complementari a tests.py.
+#
+# tests.py misura insert ed extract_all isolati; qui invece si misurano
+# scenari specifici (sequenze di operazioni miste, varianti delle strutture).
+# Ogni benchmark scrive un CSV nella cartella dei risultati:
+#   - adaptive_results.csv → AdaptivePriorityQueue su tracce a fasi
+#   - payload_results.csv  → coppie (priorità, item) contro tuple
+#   - double_ended_results.csv → min-max heap contro due heap speculari
+#   - bounded_results.csv  → top-K con BoundedPriorityQueue contro heap completo
+#   - cancel_results.csv   → remove a diversi tassi di cancellazione
+#   - batch_results.csv    → insert_many a blocchi contro insert una per una
+#   - snapshot_results.csv → dump/load binario contro pickle
+#   - fork_results.csv     → simulazioni "what-if" con molte copie della coda
+#   - nodes_results.csv    → nodi con __dict__ / __slots__ / pool nelle liste
+#   - calendar_results.csv → calendar queue contro heap su tracce "hold"
+#
+# Uso:
+#     python benchmarks.py --bench adaptive --ns 1000,5000 --runs 3
+
+
+import os
+import math
+import csv
+import heapq
+import pickle
+import random
+import argparse
+import tempfile
+from contextlib import contextmanager
+from operator import itemgetter
+
+from utils import generate_input, iter_input, time_function, peak_memory, aggregate_times
+from tests import get_impls, ensure_results_dir, run_insert_test
+from adaptive_priority_queue import AdaptivePriorityQueue
+from heap_priority_queue import HeapPriorityQueue
+from linked_list_priority_queue import LinkedListPriorityQueue
+from sorted_linked_list_priority_queue import SortedLinkedListPriorityQueue
+from min_max_heap_priority_queue import MinMaxHeapPriorityQueue
+from bounded_priority_queue import BoundedPriorityQueue
+from persistent_priority_queue import PersistentPriorityQueue
+from calendar_priority_queue import CalendarPriorityQueue
+from stdlib_priority_queues import HeapqPriorityQueue
+from priority_queue_base import _NO_ITEM
+from linked_list_node import Node, NodePool
+import linked_list_priority_queue
+import sorted_linked_list_priority_queue
+
+
+def write_rows(path, header, rows):
+    """Scrive una tabella (header + righe) in formato CSV."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    print("Results saved to:", path)
+
+
+# -----------------------------------------------------------------------
+# TRACCE DI OPERAZIONI
+# -----------------------------------------------------------------------
+
+# Ogni traccia è una lista di operazioni:
+#   ("i", key) → insert(key)
+#   ("e",)     → extract_max()
+#   ("p",)     → peek()
+
+def _phase(ops, n_ops, p_insert, p_extract, size, rng, key_range):
+    """
+    Aggiunge a 'ops' una fase di 'n_ops' operazioni casuali con le
+    probabilità indicate (il resto sono peek).
+    Tiene traccia della dimensione per non estrarre mai da una coda vuota.
+    Restituisce la dimensione finale.
+    """
+    for _ in range(n_ops):
+        r = rng.random()
+        if size == 0 or r < p_insert:
+            ops.append(("i", rng.randrange(key_range)))
+            size += 1
+        elif r < p_insert + p_extract:
+            ops.append(("e",))
+            size -= 1
+        else:
+            ops.append(("p",))
+    return size
+
+
+def phased_trace(n, kind, seed=0):
+    """
+    Genera una traccia di operazioni a fasi.
+
+    kind:
+    - 'load_drain' : n insert seguite da n extract_max
+    - 'phases'     : insert-heavy → extract-heavy → peek-heavy → insert-heavy,
+                     ognuna di n operazioni
+    - 'bursts'     : blocchi alternati di n/10 insert e n/10 extract_max
+    """
+    rng = random.Random(seed)
+    key_range = max(1000, n * 10)
+    ops = []
+
+    if kind == "load_drain":
+        ops.extend(("i", rng.randrange(key_range)) for _ in range(n))
+        ops.extend(("e",) for _ in range(n))
+
+    elif kind == "phases":
+        size = 0
+        size = _phase(ops, n, 0.9, 0.1, size, rng, key_range)
+        size = _phase(ops, n, 0.1, 0.9, size, rng, key_range)
+        size = _phase(ops, n, 0.1, 0.1, size, rng, key_range)
+        _phase(ops, n, 0.9, 0.1, size, rng, key_range)
+
+    elif kind == "bursts":
+        block = max(1, n // 10)
+        for _ in range(10):
+            ops.extend(("i", rng.randrange(key_range)) for _ in range(block))
+            ops.extend(("e",) for _ in range(block // 2))
+
+    else:
+        raise ValueError("kind must be one of 'load_drain','phases','bursts'")
+
+    return ops
+
+
+def run_trace(pq, ops):
+    """
+    Esegue la traccia sulla coda 'pq'.
+    Restituisce la lista dei valori restituiti da extract_max e peek,
+    usata per verificare che tutte le implementazioni concordino.
+    """
+    out = []
+    for op in ops:
+        if op[0] == "i":
+            pq.insert(op[1])
+        elif op[0] == "e":
+            out.append(pq.extract_max())
+        else:
+            out.append(pq.peek())
+    return out
+
+
+# -----------------------------------------------------------------------
+# BENCHMARK
+# -----------------------------------------------------------------------
+
+def bench_adaptive(out_dir, ns, runs):
+    """
+    Confronta AdaptivePriorityQueue con tutte le implementazioni fisse
+    di tests.get_impls su tracce a fasi (vedi phased_trace).
+
+    Colonne: trace, n, impl, median_s, mean_s, stdev_s, migrations, valid
+    """
+    impls = dict(get_impls())
+    impls["adaptive"] = AdaptivePriorityQueue
+
+    rows = []
+    for n in ns:
+        for kind in ("load_drain", "phases", "bursts"):
+            ops = phased_trace(n, kind)
+            expected = None
+
+            for impl_name, impl_cls in impls.items():
+                times = []
+                valid = True
+                migrations = 0
+
+                for _ in range(runs):
+                    pq = impl_cls()
+                    t, out = time_function(run_trace, pq, ops)
+                    times.append(t)
+
+                    # La prima implementazione fa da riferimento
+                    if expected is None:
+                        expected = out
+                    valid = valid and out == expected
+                    migrations = getattr(pq, "migrations", 0)
+
+                stats = aggregate_times(times)
+                rows.append([
+                    kind, n, impl_name,
+                    stats["median"], stats["mean"], stats["stdev"],
+                    migrations, valid
+                ])
+                print(f"[adaptive] trace={kind} n={n} impl={impl_name} "
+                      f"median={stats['median']:.6f}s valid={valid}")
+
+    write_rows(
+        os.path.join(out_dir, "adaptive_results.csv"),
+        ["trace", "n", "impl", "median_s", "mean_s", "stdev_s", "migrations", "valid"],
+        rows
+    )
+
+
+# Implementazioni che accettano tuple come priorità (stile 'tuple' di
+# bench_payload). heapq, queue e calendar negano la priorità (-key), quindi
+# richiedono priorità numeriche: per loro lo stile 'tuple' viene saltato.
+TUPLE_PRIORITY_IMPLS = (
+    "heap", "linked_list", "sorted_linked_list",
+    "min_max_heap", "sorted_array", "persistent",
+)
+
+
+def _fill_and_drain(pq, entries, style):
+    """
+    Inserisce tutte le coppie (priorità, payload) in 'pq' secondo lo stile
+    indicato e poi estrae tutto. Restituisce i payload estratti.
+
+    style:
+    - 'pair'  : insert(priority, payload)      → array paralleli / campo key
+    - 'tuple' : insert((priority, seq, payload)) → confronto fra tuple;
+                il seq evita di confrontare i payload a parità di priorità
+    - 'key'   : coda con key=itemgetter(0), insert((priority, payload))
+    """
+    if style == "pair":
+        for p, payload in entries:
+            pq.insert(p, payload)
+        return [pq.extract_max() for _ in entries]
+
+    if style == "tuple":
+        # Con una max-queue il seq va negato per avere l'ordine FIFO
+        for seq, (p, payload) in enumerate(entries):
+            pq.insert((p, -seq, payload))
+        return [pq.extract_max()[2] for _ in entries]
+
+    for e in entries:
+        pq.insert(e)
+    return [pq.extract_max()[1] for _ in entries]
+
+
+def bench_payload(out_dir, ns, runs):
+    """
+    Confronta il supporto nativo delle coppie (priorità, item) con
+    l'approccio "ingenuo" a tuple, per ogni implementazione.
+
+    I payload sono dizionari (non confrontabili). Il caso 'repeated'
+    produce molte priorità uguali, dove le tuple devono confrontare
+    anche il secondo campo. Lo stile 'tuple' è misurato solo per le
+    implementazioni in TUPLE_PRIORITY_IMPLS.
+
+    Colonne: impl, style, n, case, median_s, mean_s, stdev_s, valid
+    """
+    rows = []
+    for n in ns:
+        for case in ("random", "repeated"):
+            priorities = generate_input(n, case=case, seed=0)
+            entries = [(p, {"id": i}) for i, p in enumerate(priorities)]
+
+            # Ordine atteso: priorità decrescente, FIFO a parità
+            order = sorted(range(n), key=lambda i: -priorities[i])
+            expected = [entries[i][1] for i in order]
+
+            for impl_name, impl_cls in get_impls().items():
+                for style in ("pair", "tuple", "key"):
+                    if style == "tuple" and impl_name not in TUPLE_PRIORITY_IMPLS:
+                        continue
+                    times = []
+                    valid = True
+                    for _ in range(runs):
+                        pq = impl_cls(key=itemgetter(0)) if style == "key" else impl_cls()
+                        t, out = time_function(_fill_and_drain, pq, entries, style)
+                        times.append(t)
+                        valid = valid and out == expected
+
+                    stats = aggregate_times(times)
+                    rows.append([
+                        impl_name, style, n, case,
+                        stats["median"], stats["mean"], stats["stdev"], valid
+                    ])
+                    print(f"[payload] impl={impl_name} style={style} n={n} case={case} "
+                          f"median={stats['median']:.6f}s valid={valid}")
+
+    write_rows(
+        os.path.join(out_dir, "payload_results.csv"),
+        ["impl", "style", "n", "case", "median_s", "mean_s", "stdev_s", "valid"],
+        rows
+    )
+
+
+class MirroredHeaps:
+    """
+    Soluzione "a due code" usata prima del min-max heap: un max-heap e un
+    heap sulle priorità negate (per il minimo), entrambi con tutti gli
+    elementi. Un elemento estratto da una coda resta nell'altra e viene
+    scartato in modo pigro quando arriva in cima.
+    Serve solo come termine di confronto nei benchmark.
+    """
+
+    def __init__(self):
+        self.max_heap = HeapPriorityQueue()
+        self.min_heap = HeapPriorityQueue()
+        self.alive = {}  # seq → priorità degli elementi ancora presenti
+        self._seq = 0
+
+    def size(self):
+        return len(self.alive)
+
+    def insert(self, key):
+        self.max_heap.insert(key, self._seq)
+        self.min_heap.insert(-key, self._seq)
+        self.alive[self._seq] = key
+        self._seq += 1
+
+    def _pop_alive(self, heap):
+        while True:
+            seq = heap.extract_max()
+            if seq in self.alive:
+                return self.alive.pop(seq)
+
+    def extract_max(self):
+        return self._pop_alive(self.max_heap)
+
+    def extract_min(self):
+        return self._pop_alive(self.min_heap)
+
+
+def _bounded_eviction(pq, keys, capacity):
+    """
+    Carico tipico di una coda doppia: si inseriscono le chiavi tenendo al
+    massimo 'capacity' elementi (oltre si scarta il minimo) e ogni 4
+    inserimenti si serve il massimo.
+    Restituisce la sequenza delle chiavi estratte (massimi e minimi).
+    """
+    out = []
+    for i, k in enumerate(keys):
+        pq.insert(k)
+        if pq.size() > capacity:
+            out.append(pq.extract_min())
+        if i % 4 == 3:
+            out.append(pq.extract_max())
+    return out
+
+
+def bench_double_ended(out_dir, ns, runs):
+    """
+    Confronta MinMaxHeapPriorityQueue con due heap speculari
+    (MirroredHeaps) sul carico di _bounded_eviction, con capacità n/4.
+    Oltre al tempo misura il picco di memoria.
+
+    Colonne: impl, n, case, median_s, mean_s, stdev_s, peak_bytes, valid
+    """
+    impls = {
+        "min_max_heap": MinMaxHeapPriorityQueue,
+        "mirrored_heaps": MirroredHeaps,
+    }
+
+    rows = []
+    for n in ns:
+        capacity = max(1, n // 4)
+        for case in ("random", "ascending", "repeated"):
+            keys = generate_input(n, case=case, seed=0)
+            expected = None
+
+            for impl_name, impl_cls in impls.items():
+                times = []
+                valid = True
+                for _ in range(runs):
+                    t, out = time_function(_bounded_eviction, impl_cls(), keys, capacity)
+                    times.append(t)
+                    if expected is None:
+                        expected = out
+                    valid = valid and out == expected
+
+                peak, _ = peak_memory(_bounded_eviction, impl_cls(), keys, capacity)
+
+                stats = aggregate_times(times)
+                rows.append([
+                    impl_name, n, case,
+                    stats["median"], stats["mean"], stats["stdev"], peak, valid
+                ])
+                print(f"[double_ended] impl={impl_name} n={n} case={case} "
+                      f"median={stats['median']:.6f}s peak={peak}B valid={valid}")
+
+    write_rows(
+        os.path.join(out_dir, "double_ended_results.csv"),
+        ["impl", "n", "case", "median_s", "mean_s", "stdev_s", "peak_bytes", "valid"],
+        rows
+    )
+
+
+def _top_k(method, stream, k):
+    """
+    Calcola le k chiavi più grandi di uno stream di blocchi di chiavi
+    con il metodo indicato e le restituisce in ordine decrescente.
+
+    method:
+    - 'heap'         : HeapPriorityQueue con tutte le chiavi, poi k extract_max
+    - 'bounded'      : BoundedPriorityQueue(k), una offer per chiave
+    - 'bounded_many' : BoundedPriorityQueue(k), offer_many per blocco
+    """
+    if method == "heap":
+        pq = HeapPriorityQueue()
+        for chunk in stream:
+            for key in chunk:
+                pq.insert(key)
+        return [pq.extract_max() for _ in range(min(k, pq.size()))]
+
+    pq = BoundedPriorityQueue(k)
+    if method == "bounded":
+        for chunk in stream:
+            for key in chunk:
+                pq.offer(key)
+    else:
+        for chunk in stream:
+            pq.offer_many(chunk)
+
+    out = [pq.extract_min() for _ in range(pq.size())]
+    out.reverse()
+    return out
+
+
+def bench_bounded(out_dir, ns, runs):
+    """
+    Confronta il calcolo delle top-K chiavi di uno stream con
+    BoundedPriorityQueue (offer e offer_many) e con un HeapPriorityQueue
+    che conserva tutte le chiavi, per diversi rapporti K/n.
+    I tempi sono misurati su blocchi già generati, per non contare la
+    generazione casuale; il picco di memoria è misurato consumando
+    direttamente lo stream (utils.iter_input), come in produzione.
+
+    Colonne: method, n, k, ratio, case, median_s, mean_s, stdev_s, peak_bytes, valid
+    """
+    rows = []
+    for n in ns:
+        for ratio in (0.001, 0.01, 0.1):
+            k = max(1, int(n * ratio))
+            for case in ("random", "ascending"):
+                chunks = list(iter_input(n, case=case, seed=0, chunk_size=4096))
+                expected = None
+
+                for method in ("heap", "bounded", "bounded_many"):
+                    times = []
+                    valid = True
+                    for _ in range(runs):
+                        t, out = time_function(_top_k, method, chunks, k)
+                        times.append(t)
+                        if expected is None:
+                            expected = out
+                        valid = valid and out == expected
+
+                    stream = iter_input(n, case=case, seed=0, chunk_size=4096)
+                    peak, _ = peak_memory(_top_k, method, stream, k)
+
+                    stats = aggregate_times(times)
+                    rows.append([
+                        method, n, k, ratio, case,
+                        stats["median"], stats["mean"], stats["stdev"], peak, valid
+                    ])
+                    print(f"[bounded] method={method} n={n} k={k} case={case} "
+                          f"median={stats['median']:.6f}s peak={peak}B valid={valid}")
+
+    write_rows(
+        os.path.join(out_dir, "bounded_results.csv"),
+        ["method", "n", "k", "ratio", "case",
+         "median_s", "mean_s", "stdev_s", "peak_bytes", "valid"],
+        rows
+    )
+
+
+def cancel_trace(n, rate, seed=0):
+    """
+    Genera una traccia da job scheduler con cancellazioni:
+    n insert ("i", priorità, id); dopo ogni insert, con probabilità 'rate',
+    la cancellazione ("c", id) di un lavoro ancora in coda scelto a caso;
+    ogni 4 insert un extract_max ("e",). Alla fine si svuota la coda.
+
+    Per sapere quali lavori sono ancora in coda, la traccia viene simulata
+    con heapq (priorità negata, id come spareggio FIFO).
+    """
+    rng = random.Random(seed)
+    key_range = max(1000, n * 10)
+    ops = []
+
+    live = []        # id in coda (per la scelta casuale)
+    position = {}    # id → indice in 'live'
+    ref = []         # heap di riferimento (-priorità, id)
+    cancelled = set()
+
+    def drop(job):
+        # rimozione O(1) da 'live': scambio con l'ultimo
+        i = position.pop(job)
+        last = live.pop()
+        if last != job:
+            live[i] = last
+            position[last] = i
+
+    def pop_ref():
+        while True:
+            _, job = heapq.heappop(ref)
+            if job not in cancelled:
+                return job
+
+    for job in range(n):
+        key = rng.randrange(key_range)
+        ops.append(("i", key, job))
+        position[job] = len(live)
+        live.append(job)
+        heapq.heappush(ref, (-key, job))
+
+        if live and rng.random() < rate:
+            victim = live[rng.randrange(len(live))]
+            drop(victim)
+            cancelled.add(victim)
+            ops.append(("c", victim))
+
+        if job % 4 == 3 and live:
+            drop(pop_ref())
+            ops.append(("e",))
+
+    ops.extend(("e",) for _ in range(len(live)))
+    return ops
+
+
+def run_cancel_trace(pq, ops, style):
+    """
+    Esegue una traccia di cancel_trace e restituisce gli id estratti.
+
+    style:
+    - 'handle'  : remove(handle restituito da insert)
+    - 'key'     : remove(id), con ricerca dell'item
+    - 'rebuild' : come si faceva prima di remove: si ricostruisce tutta
+                  la coda (heap) senza l'elemento annullato
+    """
+    handles = {}
+    out = []
+    for op in ops:
+        if op[0] == "i":
+            h = pq.insert(op[1], op[2])
+            if style == "handle":
+                handles[op[2]] = h
+        elif op[0] == "c":
+            if style == "handle":
+                pq.remove(handles.pop(op[1]))
+            elif style == "key":
+                pq.remove(op[1])
+            else:
+                order = sorted(range(len(pq.data)), key=pq.seqs.__getitem__)
+                keep = [i for i in order if pq.items[i] != op[1]]
+                pq = HeapPriorityQueue.from_keys([pq.data[i] for i in keep],
+                                                 [pq.items[i] for i in keep])
+        else:
+            out.append(pq.extract_max())
+    return out
+
+
+def bench_cancel(out_dir, ns, runs):
+    """
+    Misura il costo delle cancellazioni con remove a diversi tassi di
+    cancellazione (frazione delle insert seguite da una cancellazione).
+
+    Configurazioni: heap con handle (tombstone, HeapPriorityQueue con
+    handles=True), heap per chiave, heap ricostruito a ogni cancellazione,
+    liste con handle (nodo), min-max heap per chiave.
+
+    Colonne: impl, style, n, rate, median_s, mean_s, stdev_s, valid
+    """
+    configs = [
+        ("heap", lambda: HeapPriorityQueue(handles=True), "handle"),
+        ("heap", HeapPriorityQueue, "key"),
+        ("heap", HeapPriorityQueue, "rebuild"),
+        ("linked_list", LinkedListPriorityQueue, "handle"),
+        ("sorted_linked_list", SortedLinkedListPriorityQueue, "handle"),
+        ("min_max_heap", MinMaxHeapPriorityQueue, "key"),
+    ]
+
+    rows = []
+    for n in ns:
+        for rate in (0.0, 0.1, 0.5, 0.9):
+            ops = cancel_trace(n, rate)
+            expected = None
+
+            for impl_name, impl_cls, style in configs:
+                times = []
+                valid = True
+                for _ in range(runs):
+                    t, out = time_function(run_cancel_trace, impl_cls(), ops, style)
+                    times.append(t)
+                    if expected is None:
+                        expected = out
+                    valid = valid and out == expected
+
+                stats = aggregate_times(times)
+                rows.append([
+                    impl_name, style, n, rate,
+                    stats["median"], stats["mean"], stats["stdev"], valid
+                ])
+                print(f"[cancel] impl={impl_name} style={style} n={n} rate={rate} "
+                      f"median={stats['median']:.6f}s valid={valid}")
+
+    write_rows(
+        os.path.join(out_dir, "cancel_results.csv"),
+        ["impl", "style", "n", "rate", "median_s", "mean_s", "stdev_s", "valid"],
+        rows
+    )
+
+
+def _insert_batches(pq_class, keys, batch):
+    """Inserisce 'keys' in una nuova coda a blocchi di 'batch' con insert_many."""
+    pq = pq_class()
+    for i in range(0, len(keys), batch):
+        pq.insert_many(keys[i:i + batch])
+    return pq
+
+
+def bench_batch(out_dir, ns, runs):
+    """
+    Confronta, per SortedLinkedListPriorityQueue, l'inserimento di n chiavi
+    casuali una per una (run_insert_test di tests.py) con insert_many a
+    blocchi di diverse dimensioni (fusione ordinata di ogni blocco).
+
+    Colonne: method, batch, n, median_s, mean_s, stdev_s, valid
+    """
+    rows = []
+    for n in ns:
+        keys = generate_input(n, case="random", seed=0)
+        expected = sorted(keys, reverse=True)
+
+        configs = [("loop", 1)]
+        configs += [("insert_many", b) for b in (1, 10, 100, 1000, n) if b <= n]
+
+        for method, batch in configs:
+            times = []
+            valid = True
+            for _ in range(runs):
+                if method == "loop":
+                    t, pq = run_insert_test(SortedLinkedListPriorityQueue, keys)
+                else:
+                    t, pq = time_function(_insert_batches,
+                                          SortedLinkedListPriorityQueue, keys, batch)
+                times.append(t)
+                valid = valid and [pq.extract_max() for _ in keys] == expected
+
+            stats = aggregate_times(times)
+            rows.append([method, batch, n, stats["median"], stats["mean"],
+                         stats["stdev"], valid])
+            print(f"[batch] method={method} batch={batch} n={n} "
+                  f"median={stats['median']:.6f}s valid={valid}")
+
+    write_rows(
+        os.path.join(out_dir, "batch_results.csv"),
+        ["method", "batch", "n", "median_s", "mean_s", "stdev_s", "valid"],
+        rows
+    )
+
+
+def _save(pq, path, method):
+    """Salva la coda su file con dump (snapshot) o con pickle."""
+    with open(path, "wb") as f:
+        if method == "snapshot":
+            pq.dump(f)
+        else:
+            pickle.dump(pq, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _restore(pq_class, path, method):
+    """Ricarica una coda salvata da _save."""
+    with open(path, "rb") as f:
+        if method == "snapshot":
+            return pq_class.load(f)
+        return pickle.load(f)
+
+
+def bench_snapshot(out_dir, ns, runs):
+    """
+    Misura il throughput (chiavi al secondo) di salvataggio e ripristino
+    su file di ogni implementazione: dump/load (header + array tipizzato)
+    contro pickle dell'intero oggetto.
+
+    pickle può fallire: con liste lunghe (RecursionError, ricorsione sul
+    campo next dei nodi) e con queue.PriorityQueue (TypeError, contiene un
+    lock). La riga viene registrata con tempi vuoti e valid=False.
+    La correttezza si verifica confrontando le prime 1000 estrazioni
+    con le 1000 chiavi più grandi (heapq.nlargest).
+
+    Colonne: impl, method, n, dump_s, load_s, size_bytes,
+             dump_keys_per_s, load_keys_per_s, valid
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "queue.bin")
+
+        for n in ns:
+            keys = generate_input(n, case="random", seed=0)
+            expected = heapq.nlargest(min(n, 1000), keys)
+
+            for impl_name, impl_cls in get_impls().items():
+                original = impl_cls.from_keys(keys)
+
+                for method in ("snapshot", "pickle"):
+                    dump_times = []
+                    load_times = []
+                    error = None
+                    try:
+                        for _ in range(runs):
+                            t, _ = time_function(_save, original, path, method)
+                            dump_times.append(t)
+                            restored = None  # libera la copia del run precedente
+                            t, restored = time_function(_restore, impl_cls, path, method)
+                            load_times.append(t)
+                    except (RecursionError, TypeError) as e:
+                        error = type(e).__name__
+
+                    if error is not None:
+                        rows.append([impl_name, method, n, "", "", "", "", "", False])
+                        print(f"[snapshot] impl={impl_name} method={method} n={n} "
+                              f"failed: {error}")
+                        continue
+
+                    size_bytes = os.path.getsize(path)
+                    valid = restored.size() == n and all(
+                        restored.extract_max() == k for k in expected
+                    )
+                    del restored
+
+                    dump_s = aggregate_times(dump_times)["median"]
+                    load_s = aggregate_times(load_times)["median"]
+                    rows.append([impl_name, method, n, dump_s, load_s, size_bytes,
+                                 n / dump_s, n / load_s, valid])
+                    print(f"[snapshot] impl={impl_name} method={method} n={n} "
+                          f"dump={dump_s:.4f}s load={load_s:.4f}s "
+                          f"size={size_bytes} valid={valid}")
+
+                del original
+
+    write_rows(
+        os.path.join(out_dir, "snapshot_results.csv"),
+        ["impl", "method", "n", "dump_s", "load_s", "size_bytes",
+         "dump_keys_per_s", "load_keys_per_s", "valid"],
+        rows
+    )
+
+
+def _copy_heap(pq):
+    """Copia di un HeapPriorityQueue: copia dei tre array. O(n)"""
+    copy = HeapPriorityQueue()
+    copy.data = list(pq.data)
+    copy.items = list(pq.items)
+    copy.seqs = list(pq.seqs)
+    copy._seq = pq._seq
+    copy._live = None if pq._live is None else set(pq._live)
+    copy._removed = set(pq._removed)
+    return copy
+
+
+def _copy_sorted_list(pq):
+    """Copia di una SortedLinkedListPriorityQueue: scansione dei nodi. O(n)"""
+    copy = SortedLinkedListPriorityQueue()
+    tail = None
+    current = pq.head
+    while current is not None:
+        node = Node(current.key, None, current.item)
+        if tail is None:
+            copy.head = node
+        else:
+            tail.next = node
+        tail = node
+        current = current.next
+    copy.n = pq.n
+    return copy
+
+
+def run_forks(pq, fork, scenarios):
+    """
+    Simulazione "what-if": per ogni scenario crea una copia della coda con
+    'fork', vi applica le operazioni dello scenario (chiave = insert,
+    None = extract_max) e raccoglie gli item estratti.
+    La coda di partenza non viene mai modificata.
+    """
+    results = []
+    for ops in scenarios:
+        branch = fork(pq)
+        out = []
+        for op in ops:
+            if op is None:
+                out.append(branch.extract_max())
+            else:
+                branch.insert(op)
+        results.append(out)
+    return results
+
+
+def bench_fork(out_dir, ns, runs, forks=1000, depth=8):
+    """
+    Carico "fork-heavy": a partire da una coda di n elementi si simulano
+    'forks' scenari alternativi, ciascuno di 'depth' operazioni
+    (metà insert, metà extract_max) su una copia indipendente della coda.
+
+    Metodi di copia:
+    - persistent         : PersistentPriorityQueue.fork, O(1)
+    - heap_copy          : copia degli array di HeapPriorityQueue, O(n)
+    - sorted_list_copy   : copia nodo per nodo della lista ordinata, O(n)
+
+    Colonne: method, n, forks, depth, median_s, mean_s, stdev_s, valid
+    """
+    configs = [
+        ("persistent", PersistentPriorityQueue, PersistentPriorityQueue.fork),
+        ("heap_copy", HeapPriorityQueue, _copy_heap),
+        ("sorted_list_copy", SortedLinkedListPriorityQueue, _copy_sorted_list),
+    ]
+
+    rows = []
+    for n in ns:
+        keys = generate_input(n, case="random", seed=0)
+        rng = random.Random(1)
+        key_range = max(1000, n * 10)
+        scenarios = []
+        for _ in range(forks):
+            ops = [rng.randrange(key_range) for _ in range(depth // 2)]
+            ops += [None] * (depth - depth // 2)
+            rng.shuffle(ops)
+            scenarios.append(ops)
+
+        expected = None
+        for method, impl_cls, fork in configs:
+            pq = impl_cls.from_keys(keys)
+            times = []
+            valid = True
+            for _ in range(runs):
+                t, results = time_function(run_forks, pq, fork, scenarios)
+                times.append(t)
+                if expected is None:
+                    expected = results
+                valid = valid and results == expected and pq.size() == n
+
+            stats = aggregate_times(times)
+            rows.append([method, n, forks, depth, stats["median"], stats["mean"],
+                         stats["stdev"], valid])
+            print(f"[fork] method={method} n={n} forks={forks} "
+                  f"median={stats['median']:.6f}s valid={valid}")
+
+    write_rows(
+        os.path.join(out_dir, "fork_results.csv"),
+        ["method", "n", "forks", "depth", "median_s", "mean_s", "stdev_s", "valid"],
+        rows
+    )
+
+
+class DictNode:
+    """
+    Nodo "classico" con __dict__ per istanza, com'era prima di
+    linked_list_node.Node: serve come riferimento in bench_nodes.
+    """
+    def __init__(self, key, next=None, item=_NO_ITEM):
+        self.key = key
+        self.next = next
+        self.item = key if item is _NO_ITEM else item
+
+
+@contextmanager
+def _node_class(cls):
+    """Fa usare temporaneamente la classe di nodo 'cls' alle due liste."""
+    modules = (linked_list_priority_queue, sorted_linked_list_priority_queue)
+    saved = [m.Node for m in modules]
+    for m in modules:
+        m.Node = cls
+    try:
+        yield
+    finally:
+        for m, node_cls in zip(modules, saved):
+            m.Node = node_cls
+
+
+def _hold(pq, keys):
+    """Hold model: per ogni chiave un extract_max seguito da una insert."""
+    out = []
+    for k in keys:
+        out.append(pq.extract_max())
+        pq.insert(k)
+    return out
+
+
+def bench_nodes(out_dir, ns, runs, hold_ops=2000):
+    """
+    Confronta, per le due code a lista concatenata, tre varianti di nodo:
+    - dict  : nodo con __dict__ (DictNode, la versione precedente)
+    - slots : linked_list_node.Node con __slots__
+    - pool  : Node con __slots__ e NodePool (riuso dei nodi estratti)
+
+    Misure:
+    - memoria di picco (tracemalloc) per inserire n chiavi
+    - tempo di riempimento (n insert, come run_insert_test)
+    - tempo di 'hold_ops' passi di hold model (extract_max + insert)
+
+    Colonne: impl, node, n, peak_bytes, bytes_per_elem, fill_s, hold_s, valid
+    """
+    impls = [
+        ("linked_list", LinkedListPriorityQueue),
+        ("sorted_linked_list", SortedLinkedListPriorityQueue),
+    ]
+
+    rows = []
+    for n in ns:
+        keys = generate_input(n, case="random", seed=0)
+        hold_keys = generate_input(hold_ops, case="random", seed=1,
+                                   random_range=max(1000, n * 10))
+
+        for impl_name, impl_cls in impls:
+            expected = None
+            for node in ("dict", "slots", "pool"):
+                if node == "pool":
+                    def factory():
+                        return impl_cls(pool=NodePool())
+                else:
+                    factory = impl_cls
+
+                with _node_class(DictNode if node == "dict" else Node):
+                    peak, _ = peak_memory(run_insert_test, factory, keys)
+
+                    fill_times = []
+                    hold_times = []
+                    valid = True
+                    for _ in range(runs):
+                        t, pq = run_insert_test(factory, keys)
+                        fill_times.append(t)
+                        t, out = time_function(_hold, pq, hold_keys)
+                        hold_times.append(t)
+                        if expected is None:
+                            expected = out
+                        valid = valid and out == expected
+
+                fill_s = aggregate_times(fill_times)["median"]
+                hold_s = aggregate_times(hold_times)["median"]
+                rows.append([impl_name, node, n, peak, peak / n, fill_s, hold_s, valid])
+                print(f"[nodes] impl={impl_name} node={node} n={n} "
+                      f"bytes/elem={peak / n:.1f} fill={fill_s:.6f}s "
+                      f"hold={hold_s:.6f}s valid={valid}")
+
+    write_rows(
+        os.path.join(out_dir, "nodes_results.csv"),
+        ["impl", "node", "n", "peak_bytes", "bytes_per_elem", "fill_s", "hold_s", "valid"],
+        rows
+    )
+
+
+# Distribuzioni degli intervalli tra eventi (media 1):
+# nome → (generatore dell'intervallo, generatore del tempo residuo)
+# Il tempo residuo è la distanza da "adesso" di un evento in attesa nello
+# stato stazionario dei passi di hold, con densità (1 - F(x)) / media:
+# - esponenziale: senza memoria, il residuo ha la stessa distribuzione
+# - uniforme su [0, 2]: densità 1 - x/2, campionata invertendo la
+#   ripartizione x - x²/4
+GAP_DISTRIBUTIONS = {
+    "exponential": (lambda rng: rng.expovariate(1.0),
+                    lambda rng: rng.expovariate(1.0)),
+    "uniform": (lambda rng: rng.uniform(0.0, 2.0),
+                lambda rng: 2.0 * (1.0 - math.sqrt(1.0 - rng.random()))),
+}
+
+
+def hold_trace(n, ops, dist, seed=0):
+    """
+    Genera una traccia "hold model" per uno scheduler a eventi:
+    - 'n' istanti iniziali indipendenti, campionati dal tempo residuo della
+      distribuzione: la coda parte già nello stato stazionario dei passi di
+      hold (circa n eventi per unità di tempo vicino al fronte, nessun
+      evento oltre l'intervallo massimo), senza bisogno di un riscaldamento
+    - 'ops' intervalli: a ogni passo si estrae l'evento più vicino e se ne
+      programma uno nuovo all'istante estratto + intervallo
+    Restituisce (istanti iniziali, intervalli).
+    """
+    rng = random.Random(seed)
+    gap, residual = GAP_DISTRIBUTIONS[dist]
+    initial = [residual(rng) for _ in range(n)]
+    gaps = [gap(rng) for _ in range(ops)]
+    return initial, gaps
+
+
+def run_hold(pq, gaps):
+    """
+    Esegue i passi di una traccia di hold_trace su una coda già riempita
+    con gli istanti iniziali. La coda estrae il massimo, quindi la priorità
+    di un evento è -istante (l'evento più vicino esce per primo).
+    Restituisce gli istanti estratti.
+    """
+    out = []
+    for g in gaps:
+        t = -pq.extract_max()
+        out.append(t)
+        pq.insert(-(t + g))
+    return out
+
+
+def bench_calendar(out_dir, ns, runs, ops=20000):
+    """
+    Confronta CalendarPriorityQueue con HeapPriorityQueue (e heapq come
+    riferimento in C) su tracce hold model di 'ops' passi con intervalli
+    esponenziali e uniformi, per diverse dimensioni n della coda.
+    Si misurano solo i passi di hold: la costruzione della coda iniziale
+    (from_keys) resta fuori dalla misura.
+    Alla fine stampa, per ogni distribuzione, le dimensioni in cui il
+    calendario è più veloce dell'heap.
+
+    Colonne: impl, dist, n, ops, median_s, ns_per_op, valid
+    """
+    impls = [
+        ("calendar", CalendarPriorityQueue),
+        ("heap", HeapPriorityQueue),
+        ("heapq", HeapqPriorityQueue),
+    ]
+
+    rows = []
+    medians = {}
+    for dist in GAP_DISTRIBUTIONS:
+        for n in ns:
+            initial, gaps = hold_trace(n, ops, dist)
+            keys = [-t for t in initial]
+            expected = None
+
+            for impl_name, impl_cls in impls:
+                times = []
+                valid = True
+                for _ in range(runs):
+                    pq = impl_cls.from_keys(keys)
+                    t, out = time_function(run_hold, pq, gaps)
+                    times.append(t)
+                    if expected is None:
+                        expected = out
+                    valid = valid and out == expected
+
+                median = aggregate_times(times)["median"]
+                medians[(impl_name, dist, n)] = median
+                rows.append([impl_name, dist, n, ops, median, median / ops * 1e9, valid])
+                print(f"[calendar] impl={impl_name} dist={dist} n={n} "
+                      f"median={median:.6f}s ns/op={median / ops * 1e9:.0f} valid={valid}")
+
+    for dist in GAP_DISTRIBUTIONS:
+        wins = [n for n in ns
+                if medians[("calendar", dist, n)] < medians[("heap", dist, n)]]
+        print(f"[calendar] dist={dist}: calendar faster than heap at n in {wins}")
+
+    write_rows(
+        os.path.join(out_dir, "calendar_results.csv"),
+        ["impl", "dist", "n", "ops", "median_s", "ns_per_op", "valid"],
+        rows
+    )
+
+
+# Benchmark disponibili: nome → funzione
+BENCHMARKS = {
+    "adaptive": bench_adaptive,
+    "payload": bench_payload,
+    "double_ended": bench_double_ended,
+    "bounded": bench_bounded,
+    "cancel": bench_cancel,
+    "batch": bench_batch,
+    "snapshot": bench_snapshot,
+    "fork": bench_fork,
+    "nodes": bench_nodes,
+    "calendar": bench_calendar,
+}
+
+
+def main(names, out_dir="results", ns=(1000, 5000), runs=3):
+    """Esegue i benchmark richiesti e salva i CSV in 'out_dir'."""
+    ensure_results_dir(out_dir)
+    for name in names:
+        BENCHMARKS[name](out_dir, ns, runs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run additional priority queue benchmarks.")
+    parser.add_argument("--bench", type=str, default=",".join(BENCHMARKS),
+                        help="comma-separated benchmark names: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--out", default="results", help="results directory")
+    parser.add_argument("--runs", type=int, default=3, help="runs per configuration")
+    parser.add_argument("--ns", type=str, default="1000,5000", help="comma-separated n sizes")
+
+    args = parser.parse_args()
+
+    names = [x.strip() for x in args.bench.split(",") if x.strip()]
+    for name in names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+    ns = tuple(int(x) for x in args.ns.split(",") if x.strip())
+
+    main(names, out_dir=args.out, ns=ns, runs=args.runs)
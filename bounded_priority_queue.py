@@ -0,0 +1,283 @@
+# bounded_priority_queue.py
+#
+# Coda di priorità LIMITATA (top-K): conserva solo i 'capacity' elementi
+# con priorità più alta visti finora, con memoria fissa O(K).
+#
+# Tipico uso: tenere le K chiavi più grandi di uno stream di n elementi,
+# con n >> K. Con HeapPriorityQueue servirebbero O(n) memoria e
+# O(n log n) tempo; qui bastano O(K) memoria e, nel caso medio, O(1)
+# per la maggior parte delle chiavi.
+#
+# Gli elementi conservati stanno in un MIN-heap (array paralleli data, items,
+# seqs come negli altri heap): la radice è il "confine", cioè l'elemento più
+# basso tra i K migliori. Una nuova chiave, a coda piena:
+#   - se non supera il confine viene scartata subito → O(1)
+#   - altrimenti prende il posto della radice e scende → O(log K)
+#
+# A parità di priorità vince l'elemento arrivato prima (ordine FIFO):
+# una chiave uguale al confine viene scartata.
+#
+# Complessità:
+#   offer / insert  = O(1) se scartata, O(log K) se accettata
+#   offer_many      = O(m) confronti in blocco + O(log K) per ogni accettata
+#   extract_min     = O(log K)
+#   extract_max     = O(K)   (il massimo è tra le foglie del min-heap)
+#   peek            = O(K)
+#   threshold       = O(1)
+#   remove          = O(K)   (ricerca dell'item)
+#   dump / load     = O(K)   (la capacità è salvata nel campo extra)
+
+
+from priority_queue_base import PriorityQueue, _NO_ITEM
+from snapshot import check_keys_only, write_snapshot, read_snapshot
+
+
+class BoundedPriorityQueue(PriorityQueue):
+
+    def __init__(self, capacity, key=None):
+        """
+        capacity: numero massimo di elementi conservati (K >= 1)
+        key: funzione opzionale per calcolare la priorità
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+
+        super().__init__(key)
+        self.capacity = capacity
+
+        # Min-heap del confine: priorità, item, numeri di inserimento
+        self.data = []
+        self.items = []
+        self.seqs = []
+        self._seq = 0
+
+    def size(self):
+        """Restituisce il numero di elementi conservati (al più capacity)."""
+        return len(self.data)
+
+    def threshold(self):
+        """
+        Restituisce la priorità minima tra quelle conservate (il confine),
+        oppure None se la coda non è ancora piena: in quel caso ogni nuova
+        chiave viene accettata.
+        """
+        if len(self.data) < self.capacity:
+            return None
+        return self.data[0]
+
+    def offer(self, key, item=_NO_ITEM):
+        """
+        Propone un elemento. Restituisce True se viene conservato,
+        False se viene scartato perché non supera il confine.
+        """
+        key, item = self._entry(key, item)
+        return self._offer(key, item)
+
+    def insert(self, key, item=_NO_ITEM):
+        """Come offer, ignorando il risultato: interfaccia PriorityQueue."""
+        self.offer(key, item)
+
+    def offer_many(self, keys, items=None):
+        """
+        Propone un blocco di elementi (ad esempio un blocco di
+        utils.iter_input). Restituisce il numero di elementi accettati.
+
+        Percorso veloce: a coda piena, le chiavi che non superano il
+        confine corrente vengono scartate con un filtro in blocco (list
+        comprehension), senza passare per offer. Il confine può solo
+        salire, quindi il filtro è sicuro; i sopravvissuti vengono
+        ricontrollati uno per uno contro il confine aggiornato.
+        Il blocco è elaborato a pezzi di max(64, capacità) chiavi, così
+        il confine usato dal filtro resta aggiornato; il minimo di 64
+        evita pezzi troppo piccoli (e troppe list comprehension) quando
+        la capacità è piccola.
+        """
+        keys = list(keys)
+        if self.keyfunc is not None:
+            if items is not None:
+                raise TypeError("offer_many() takes no items when key= is set")
+            items = keys
+            keys = [self.keyfunc(k) for k in keys]
+        elif items is not None:
+            items = list(items)
+
+        accepted = 0
+        i = 0
+        n = len(keys)
+
+        # Fase di riempimento: finché la coda non è piena si accetta tutto
+        while i < n and len(self.data) < self.capacity:
+            accepted += self._offer(keys[i], keys[i] if items is None else items[i])
+            i += 1
+
+        data = self.data
+        step = max(64, self.capacity)
+        while i < n:
+            stop = min(n, i + step)
+            limit = data[0]
+            candidates = [j for j, k in enumerate(keys[i:stop], i) if k > limit]
+            for j in candidates:
+                if keys[j] > data[0]:
+                    self._replace_root(keys[j], keys[j] if items is None else items[j])
+                    accepted += 1
+            i = stop
+
+        return accepted
+
+    def extract_min(self):
+        """Rimuove e restituisce l'item più basso conservato. O(log K)"""
+        if len(self.data) == 0:
+            raise IndexError("extract_min from empty bounded queue")
+        return self._remove_at(0)
+
+    def extract_max(self):
+        """Rimuove e restituisce l'item più alto conservato. O(K)"""
+        if len(self.data) == 0:
+            raise IndexError("extract_max from empty bounded queue")
+        return self._remove_at(self._max_index())
+
+    def peek(self):
+        """Restituisce l'item più alto conservato senza rimuoverlo. O(K)"""
+        if len(self.data) == 0:
+            raise IndexError("peek from empty bounded queue")
+        return self.items[self._max_index()]
+
+    def remove(self, key_or_handle):
+        """
+        Rimuove un elemento conservato il cui item è uguale alla chiave.
+        Il posto liberato potrà essere occupato da una offer successiva.
+        Complessità: O(K)
+        """
+        for i, it in enumerate(self.items):
+            if it == key_or_handle:
+                self._remove_at(i)
+                return
+        raise ValueError("item not in bounded queue")
+
+    def dump(self, fileobj):
+        """Salva il min-heap e la capacità. O(K)"""
+        check_keys_only(self.data, self.items, self.keyfunc)
+        write_snapshot(fileobj, self.data, self.capacity)
+
+    @classmethod
+    def load(cls, fileobj):
+        """
+        Ricostruisce la coda con la capacità salvata e rifà il min-heap
+        bottom-up: a parità di priorità il padre deve avere seq maggiore,
+        quindi gli indici non si possono usare come seq così come sono.
+        Complessità: O(K)
+        """
+        keys, capacity = read_snapshot(fileobj)
+        pq = cls(capacity)
+        pq.data = keys
+        pq.items = list(keys)
+        pq.seqs = list(range(len(keys)))
+        pq._seq = len(keys)
+        for i in range(len(keys) // 2 - 1, -1, -1):
+            pq._sift_down(i)
+        return pq
+
+    # -------------------------------------------------------------------
+    # METODI INTERNI (helper)
+    # -------------------------------------------------------------------
+
+    def _offer(self, key, item):
+        """offer senza calcolo della priorità: restituisce True/False."""
+        if len(self.data) < self.capacity:
+            self.data.append(key)
+            self.items.append(item)
+            self.seqs.append(self._seq)
+            self._seq += 1
+            self._sift_up(len(self.data) - 1)
+            return True
+
+        # A coda piena: confronto O(1) con il confine.
+        # A parità il nuovo elemento (seq maggiore) è il più basso → scartato.
+        if key <= self.data[0]:
+            return False
+
+        self._replace_root(key, item)
+        return True
+
+    def _replace_root(self, key, item):
+        """Sostituisce il confine con il nuovo elemento e lo fa scendere."""
+        self.data[0] = key
+        self.items[0] = item
+        self.seqs[0] = self._seq
+        self._seq += 1
+        self._sift_down(0)
+
+    def _max_index(self):
+        """
+        Indice dell'elemento più alto: in un min-heap sta tra le foglie,
+        cioè nelle posizioni n//2 .. n-1. A parità vince il seq minore.
+        """
+        data, seqs = self.data, self.seqs
+        n = len(data)
+        best = n // 2
+        for i in range(best + 1, n):
+            if data[i] > data[best] or (data[i] == data[best] and seqs[i] < seqs[best]):
+                best = i
+        return best
+
+    def _swap(self, i, j):
+        """Scambia gli elementi in posizione i e j (in tutti gli array)."""
+        data, items, seqs = self.data, self.items, self.seqs
+        data[i], data[j] = data[j], data[i]
+        items[i], items[j] = items[j], items[i]
+        seqs[i], seqs[j] = seqs[j], seqs[i]
+
+    def _remove_at(self, i):
+        """
+        Rimuove l'elemento in posizione i sostituendolo con l'ultimo,
+        poi ripristina il min-heap (verso l'alto o verso il basso).
+        """
+        last = len(self.data) - 1
+        if i != last:
+            self._swap(i, last)
+
+        self.data.pop()
+        self.seqs.pop()
+        item = self.items.pop()
+
+        if i < last:
+            self._sift_down(i)
+            self._sift_up(i)
+        return item
+
+    # Come negli altri heap, nei cicli il confronto è scritto in linea:
+    # "più basso" = priorità minore oppure, a parità, seq maggiore.
+
+    def _sift_up(self, i):
+        """Fa risalire il nodo i finché è più basso del padre."""
+        data, seqs = self.data, self.seqs
+        while i > 0:
+            p = (i - 1) // 2
+            if data[i] < data[p] or (data[i] == data[p] and seqs[i] > seqs[p]):
+                self._swap(i, p)
+                i = p
+            else:
+                break
+
+    def _sift_down(self, i):
+        """Fa scendere il nodo i verso il figlio più basso."""
+        data, seqs = self.data, self.seqs
+        n = len(data)
+        while True:
+            left = 2 * i + 1
+            right = left + 1
+            lowest = i
+
+            if left < n and (data[left] < data[lowest] or
+                             (data[left] == data[lowest] and seqs[left] > seqs[lowest])):
+                lowest = left
+
+            if right < n and (data[right] < data[lowest] or
+                              (data[right] == data[lowest] and seqs[right] > seqs[lowest])):
+                lowest = right
+
+            if lowest != i:
+                self._swap(i, lowest)
+                i = lowest
+            else:
+                break
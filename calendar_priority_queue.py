@@ -0,0 +1,223 @@
+# calendar_priority_queue.py
+#
+# Coda di priorità a CALENDARIO (calendar queue, R. Brown 1988), pensata per
+# gli scheduler a eventi in cui le chiavi sono istanti di tempo.
+#
+# L'idea è quella di un'agenda: l'asse dei tempi è diviso in "giorni" di
+# ampiezza 'width', e i giorni sono distribuiti ciclicamente su 'nb' secchi
+# (bucket): il giorno d finisce nel bucket d % nb, come i giorni di anni
+# diversi sulla stessa pagina dell'agenda. Ogni bucket è una lista ordinata.
+# Per trovare il prossimo evento si scorrono i bucket a partire dal giorno
+# corrente: se la larghezza è scelta bene (pochi eventi per giorno) il
+# prossimo evento si trova dopo pochi passi → insert ed extract O(1)
+# ammortizzati, contro O(log n) dell'heap.
+#
+# Le altre code estraggono il MASSIMO: qui il tempo interno è t = -priorità,
+# quindi l'evento con priorità massima è quello con t minimo (il più vicino
+# nel "futuro" del calendario). Per uno scheduler in cui esce per primo
+# l'evento più vicino si usa come priorità -istante (vedi benchmarks.py).
+# Le priorità devono quindi essere numeriche.
+#
+# Gli elementi sono tuple (t, seq, item) ordinate nei bucket: a parità di t
+# decide seq (numero di inserimento) → ordine FIFO, e l'item non viene mai
+# confrontato.
+#
+# RIDIMENSIONAMENTO: quando gli elementi superano 2·nb (o scendono sotto
+# nb/2) il numero di bucket raddoppia (o si dimezza) e la larghezza dei
+# giorni viene ricalcolata dalla distanza media tra i prossimi eventi
+# (campione in cima alla coda, senza le distanze anomale).
+#
+# Complessità:
+#   insert      = O(1) ammortizzato (con larghezza adatta alla distribuzione)
+#   extract_max = O(1) ammortizzato; O(nb) nel caso peggiore (ricerca diretta)
+#   peek        = come extract_max
+#   remove      = O(n)
+#   resize      = O(n log n), ammortizzato sui raddoppi/dimezzamenti
+
+
+from bisect import insort
+
+from priority_queue_base import PriorityQueue, _NO_ITEM
+from snapshot import check_keys_only, write_snapshot, read_snapshot
+
+
+# Numero minimo di bucket
+MIN_BUCKETS = 2
+
+# Numero di eventi in cima alla coda usati per stimare la larghezza
+WIDTH_SAMPLE = 25
+
+
+class CalendarPriorityQueue(PriorityQueue):
+
+    def __init__(self, key=None, width=1.0):
+        """
+        key:   funzione opzionale per calcolare la priorità
+        width: larghezza iniziale di un giorno (viene ricalcolata a ogni
+               ridimensionamento in base ai dati)
+        """
+        super().__init__(key)
+        self.nb = MIN_BUCKETS
+        self.width = float(width)
+        self.buckets = [[] for _ in range(self.nb)]
+        self.n = 0
+        self._seq = 0
+
+        # Giorno corrente: nessun elemento ha un giorno precedente
+        self.day = 0
+
+        # Numero di ridimensionamenti effettuati (utile nei benchmark)
+        self.resizes = 0
+
+    def size(self):
+        """Restituisce il numero di elementi presenti."""
+        return self.n
+
+    def insert(self, key, item=_NO_ITEM):
+        """
+        Inserisce l'elemento nel bucket del suo giorno (lista ordinata).
+        Se il giorno precede quello corrente, il calendario "torna indietro".
+        Complessità: O(1) ammortizzata
+        """
+        key, item = self._entry(key, item)
+        t = -key
+        d = int(t // self.width)
+        insort(self.buckets[d % self.nb], (t, self._seq, item))
+        self._seq += 1
+        self.n += 1
+        if d < self.day:
+            self.day = d
+
+        if self.n > 2 * self.nb:
+            self._resize(2 * self.nb)
+
+    def peek(self):
+        """Restituisce l'item con priorità massima senza rimuoverlo."""
+        if self.n == 0:
+            raise IndexError("peek from empty calendar queue")
+        return self.buckets[self._locate()][0][2]
+
+    def extract_max(self):
+        """
+        Rimuove e restituisce l'item con priorità massima (t minimo).
+        Complessità: O(1) ammortizzata
+        """
+        if self.n == 0:
+            raise IndexError("extract_max from empty calendar queue")
+        item = self.buckets[self._locate()].pop(0)[2]
+        self.n -= 1
+
+        if self.n < self.nb // 2 and self.nb > MIN_BUCKETS:
+            self._resize(self.nb // 2)
+        return item
+
+    def remove(self, key_or_handle):
+        """Rimuove un elemento il cui item è uguale alla chiave. O(n)"""
+        for bucket in self.buckets:
+            for i, entry in enumerate(bucket):
+                if entry[2] == key_or_handle:
+                    del bucket[i]
+                    self.n -= 1
+                    if self.n < self.nb // 2 and self.nb > MIN_BUCKETS:
+                        self._resize(self.nb // 2)
+                    return
+        raise ValueError("item not in calendar queue")
+
+    @classmethod
+    def from_keys(cls, keys, items=None):
+        """
+        Costruisce il calendario in blocco: un solo ridimensionamento
+        sul numero di bucket adatto a n elementi. O(n log n)
+        """
+        pq = cls()
+        keys = list(keys)
+        items = keys if items is None else list(items)
+        entries = [(-k, seq, it) for seq, (k, it) in enumerate(zip(keys, items))]
+        pq.buckets[0] = entries
+        pq.n = len(entries)
+        pq._seq = len(entries)
+
+        nb = MIN_BUCKETS
+        while pq.n > 2 * nb:
+            nb *= 2
+        pq._resize(nb)
+        return pq
+
+    def dump(self, fileobj):
+        """Salva le priorità in ordine di inserimento. O(n log n)"""
+        entries = sorted((e for b in self.buckets for e in b), key=lambda e: e[1])
+        keys = [-e[0] for e in entries]
+        check_keys_only(keys, [e[2] for e in entries], self.keyfunc)
+        write_snapshot(fileobj, keys)
+
+    @classmethod
+    def load(cls, fileobj):
+        """Ricostruisce il calendario con from_keys. O(n log n)"""
+        keys, _ = read_snapshot(fileobj)
+        return cls.from_keys(keys)
+
+    # -------------------------------------------------------------------
+    # METODI INTERNI (helper)
+    # -------------------------------------------------------------------
+
+    def _locate(self):
+        """
+        Restituisce l'indice del bucket che contiene in testa l'elemento
+        con t minimo, e sposta il giorno corrente su quel giorno.
+
+        1. scorre al più un "anno" (nb giorni) a partire dal giorno
+           corrente: la testa di un bucket appartiene al giorno che si sta
+           visitando se il suo giorno non è successivo
+        2. se l'anno è vuoto (eventi molto distanti), ricerca diretta del
+           minimo tra le teste di tutti i bucket
+        """
+        buckets, width, nb = self.buckets, self.width, self.nb
+        day = self.day
+        for _ in range(nb):
+            bucket = buckets[day % nb]
+            if bucket and bucket[0][0] // width <= day:
+                self.day = day
+                return day % nb
+            day += 1
+
+        head = min(b[0] for b in buckets if b)
+        self.day = int(head[0] // width)
+        return self.day % nb
+
+    def _resize(self, nb):
+        """
+        Ridistribuisce gli elementi su 'nb' bucket, ricalcolando la
+        larghezza dei giorni. Gli elementi vengono ordinati una volta sola
+        (sorted, in C) e accodati ai nuovi bucket, che restano ordinati.
+        """
+        entries = sorted(e for b in self.buckets for e in b)
+        width = self._sample_width(entries)
+        if width > 0:
+            self.width = width
+
+        self.nb = nb
+        self.buckets = [[] for _ in range(nb)]
+        width = self.width
+        for e in entries:
+            self.buckets[int(e[0] // width) % nb].append(e)
+
+        self.day = int(entries[0][0] // width) if entries else 0
+        self.resizes += 1
+
+    def _sample_width(self, entries):
+        """
+        Nuova larghezza dei giorni (Brown): dai primi WIDTH_SAMPLE eventi
+        (quelli che usciranno per primi) calcola la distanza media tra
+        eventi consecutivi, la ricalcola escludendo le distanze maggiori del
+        doppio della media (anomale) e restituisce tre volte il risultato.
+        Restituisce 0 se non si può stimare (meno di due eventi distinti).
+        """
+        sample = [e[0] for e in entries[:WIDTH_SAMPLE]]
+        gaps = [b - a for a, b in zip(sample, sample[1:])]
+        if not gaps:
+            return 0
+        mean = sum(gaps) / len(gaps)
+        usual = [g for g in gaps if g <= 2 * mean]
+        if not usual or sum(usual) == 0:
+            return 0
+        return 3 * sum(usual) / len(usual)
@@ -5,133 +5,327 @@
 # - l'elemento con priorità massima è in posizione 0
 # - ogni nodo ha due figli in posizioni 2*i + 1 (sinistra) e 2*i + 2 (destra)
 #
+# Gli elementi sono memorizzati in tre ARRAY PARALLELI:
+# - data[i]  = priorità (l'unico valore confrontato)
+# - items[i] = item associato (payload, mai confrontato)
+# - seqs[i]  = numero progressivo di inserimento, usato solo a parità di
+#              priorità per garantire l'ordine FIFO
+# In questo modo non servono tuple (priorità, seq, item): i confronti sono
+# tra valori primitivi e un payload non confrontabile non causa errori.
+#
+# CANCELLAZIONE PIGRA (lazy deletion):
+# remove non tocca l'heap, segna solo l'elemento come cancellato
+# ("tombstone": il suo seq entra nell'insieme _removed) → O(1) con un handle.
+# Gli handle sono OPZIONALI (HeapPriorityQueue(handles=True)): tenerli
+# validi costa un oggetto e un inserimento in un set per ogni insert, e chi
+# non cancella mai non deve pagarlo. Senza handle, remove per chiave resta
+# disponibile.
+# Gli elementi cancellati vengono scartati quando arrivano in radice
+# (peek / extract_max). Quando i tombstone superano COMPACT_RATIO degli
+# elementi memorizzati, l'heap viene compattato: si tolgono tutti gli
+# elementi cancellati e si ricostruisce bottom-up in O(n).
+#
 # Tutte le operazioni mantengono la proprietà di heap:
 #   data[parent] >= data[left_child], data[parent] >= data[right_child]
+#   (a parità di priorità, il padre ha seq minore)
 #
 # Complessità:
 #   insert      = O(log n)
 #   extract_max = O(log n)
 #   peek        = O(1)
 #   size        = O(1)
+#   from_keys   = O(n)   (costruzione bottom-up)
+#   remove      = O(1) con handle, O(n) con chiave (ricerca)
+#                 + compattazione O(n) ammortizzata sulle cancellazioni
+#   dump / load = O(n)   (l'array dell'heap viene salvato e adottato così com'è)
+
+
+from priority_queue_base import PriorityQueue, _NO_ITEM
+from snapshot import check_keys_only, write_snapshot, read_snapshot
+
+
+# Frazione di elementi cancellati oltre la quale l'heap viene compattato
+COMPACT_RATIO = 0.5
 
 
-from priority_queue_base import PriorityQueue
+class Handle:
+    """
+    Riferimento a un elemento dell'heap, restituito da insert
+    (solo con handles=True).
+    Contiene solo il numero di inserimento (seq) dell'elemento.
+    """
+    __slots__ = ("seq",)
+
+    def __init__(self, seq):
+        self.seq = seq
 
 
 class HeapPriorityQueue(PriorityQueue):
 
-    def __init__(self):
-        # Lista che rappresenta l'heap binario.
-        # Inizialmente è vuota.
+    def __init__(self, key=None, handles=False):
+        """
+        key:     funzione opzionale per calcolare la priorità
+        handles: se True insert restituisce un Handle per remove
+                 (altrimenti None, e la rimozione è solo per chiave)
+        """
+        super().__init__(key)
+        # Liste parallele che rappresentano l'heap binario.
+        # Inizialmente sono vuote.
         self.data = []
+        self.items = []
+        self.seqs = []
+
+        # Prossimo numero progressivo di inserimento
+        self._seq = 0
+
+        # Con handles=True: seq degli elementi inseriti con insert (gli
+        # unici con un handle) ancora presenti e non cancellati, per
+        # validare gli handle. None se gli handle sono disattivati.
+        self._live = set() if handles else None
+        # seq degli elementi cancellati ma ancora negli array (tombstone)
+        self._removed = set()
 
     def size(self):
-        """Restituisce il numero di elementi presenti nell'heap."""
-        return len(self.data)
+        """Restituisce il numero di elementi presenti (esclusi i cancellati)."""
+        return len(self.data) - len(self._removed)
 
     def peek(self):
         """
-        Restituisce il massimo senza rimuoverlo.
+        Restituisce l'item massimo senza rimuoverlo.
         L'elemento massimo si trova sempre in posizione 0.
         """
-        if self.size() == 0:
+        if self._removed:
+            self._purge_top()
+        if len(self.data) == 0:
             raise IndexError("peek from empty heap")
-        return self.data[0]
+        return self.items[0]
 
-    def insert(self, key):
+    def insert(self, key, item=_NO_ITEM):
         """
         Inserisce un nuovo elemento nel max-heap.
-        1. Aggiunge l'elemento alla fine dell'array (foglia più a destra)
+        1. Aggiunge l'elemento alla fine degli array (foglia più a destra)
         2. Risale l'albero con heapify_up per ripristinare la proprietà di heap.
+        Con handles=True restituisce un Handle utilizzabile con remove.
         Complessità: O(log n)
         """
-        self.data.append(key)  # inserimento in fondo
-        self._heapify_up(self.size() - 1)
+        key, item = self._entry(key, item)
+        seq = self._seq
+        self._seq += 1
+
+        # inserimento in fondo
+        self.data.append(key)
+        self.items.append(item)
+        self.seqs.append(seq)
+
+        self._heapify_up(len(self.data) - 1)
+
+        if self._live is not None:
+            self._live.add(seq)
+            return Handle(seq)
 
     def extract_max(self):
         """
-        Rimuove e restituisce l'elemento massimo (in radice).
+        Rimuove e restituisce l'item massimo (in radice).
         Procedura:
         1. Scambia la radice con l’ultimo elemento
         2. Rimuove l'ultimo elemento (che era la radice originale)
         3. Ripristina l'heap con heapify_down
         Complessità: O(log n)
         """
-        n = self.size()
-        if n == 0:
+        if self._removed:
+            self._purge_top()
+        if len(self.data) == 0:
             raise IndexError("extract_max from empty heap")
-        if n == 1:
-            # caso speciale: un solo elemento
-            return self.data.pop()
 
-        # Scambia radice ↔ ultimo elemento
-        self._swap(0, n - 1)
+        if self._live is not None:
+            self._live.discard(self.seqs[0])
+        return self._pop_root()
+
+    def remove(self, key_or_handle):
+        """
+        Cancella un elemento in modo pigro: lo segna come tombstone,
+        verrà scartato quando arriva in radice.
+        - con un Handle: O(1)
+        - con una chiave: O(n) per cercare un elemento con quell'item
+        Se i tombstone superano COMPACT_RATIO degli elementi, compatta l'heap.
+        """
+        live = self._live
+        if isinstance(key_or_handle, Handle):
+            seq = key_or_handle.seq
+            if live is None or seq not in live:
+                raise ValueError("handle not in heap")
+        else:
+            seq = self._find_seq(key_or_handle)
 
-        # Rimuove l'ultimo elemento (che era la radice)
-        max_val = self.data.pop()
+        if live is not None:
+            live.discard(seq)
+        self._removed.add(seq)
 
-        # Ripristina la proprietà di heap partendo dalla radice
-        self._heapify_down(0)
+        if len(self._removed) > COMPACT_RATIO * len(self.data):
+            self._compact()
+
+    @classmethod
+    def from_keys(cls, keys, items=None):
+        """
+        Costruisce un heap a partire da una sequenza di chiavi
+        (in ordine di inserimento) e dagli item corrispondenti.
+
+        Invece di n insert (O(n log n)) usa la costruzione bottom-up:
+        applica heapify_down a tutti i nodi interni, dall'ultimo alla radice.
+        Complessità: O(n)
+        """
+        pq = cls()
+        pq.data = list(keys)
+        pq.items = list(pq.data if items is None else items)
+        pq.seqs = list(range(len(pq.data)))
+        pq._seq = len(pq.data)
+        pq._heapify_all()
+        return pq
+
+    def dump(self, fileobj):
+        """
+        Salva l'array dell'heap così com'è (ordine di heap).
+        I tombstone vengono prima eliminati con una compattazione.
+        Complessità: O(n)
+        """
+        if self._removed:
+            self._compact()
+        check_keys_only(self.data, self.items, self.keyfunc)
+        write_snapshot(fileobj, self.data)
 
-        return max_val
+    @classmethod
+    def load(cls, fileobj):
+        """
+        Un array salvato da dump è già un heap valido: viene adottato così
+        com'è, senza heapify. Come numeri di inserimento si usano gli indici:
+        a parità di priorità il padre ha indice (quindi seq) minore del
+        figlio, e la proprietà di heap resta valida.
+        Complessità: O(n) (solo la conversione delle chiavi in lista)
+        """
+        keys, _ = read_snapshot(fileobj)
+        pq = cls()
+        pq.data = keys
+        pq.items = list(keys)
+        pq.seqs = list(range(len(keys)))
+        pq._seq = len(keys)
+        return pq
 
     # -------------------------------------------------------------------
     # METODI INTERNI (helper)
     # -------------------------------------------------------------------
 
-    def _parent(self, i):
-        """Restituisce l'indice del nodo padre."""
-        return (i - 1) // 2
+    def _heapify_all(self):
+        """Costruzione bottom-up: heapify_down su tutti i nodi interni. O(n)"""
+        for i in range(len(self.data) // 2 - 1, -1, -1):
+            self._heapify_down(i)
+
+    def _pop_root(self):
+        """
+        Rimuove la radice dagli array e restituisce il suo item:
+        1. Scambia la radice con l'ultimo elemento
+        2. Rimuove l'ultimo elemento (che era la radice originale)
+        3. Ripristina l'heap con heapify_down
+        """
+        n = len(self.data)
+        if n == 1:
+            # caso speciale: un solo elemento
+            self.data.pop()
+            self.seqs.pop()
+            return self.items.pop()
+
+        self._swap(0, n - 1)
+
+        self.data.pop()
+        self.seqs.pop()
+        max_item = self.items.pop()
+
+        self._heapify_down(0)
+        return max_item
+
+    def _purge_top(self):
+        """Scarta i tombstone che si trovano in radice."""
+        while self.data and self.seqs[0] in self._removed:
+            self._removed.discard(self.seqs[0])
+            self._pop_root()
 
-    def _left(self, i):
-        """Restituisce l'indice del figlio sinistro."""
-        return 2 * i + 1
+    def _find_seq(self, item):
+        """Restituisce il seq di un elemento non cancellato con questo item."""
+        for i, it in enumerate(self.items):
+            if it == item and self.seqs[i] not in self._removed:
+                return self.seqs[i]
+        raise ValueError("item not in heap")
 
-    def _right(self, i):
-        """Restituisce l'indice del figlio destro."""
-        return 2 * i + 2
+    def _compact(self):
+        """
+        Elimina fisicamente tutti i tombstone e ricostruisce l'heap. O(n)
+        """
+        removed = self._removed
+        keep = [i for i, s in enumerate(self.seqs) if s not in removed]
+        self.data = [self.data[i] for i in keep]
+        self.items = [self.items[i] for i in keep]
+        self.seqs = [self.seqs[i] for i in keep]
+        self._removed = set()
+        self._heapify_all()
 
     def _swap(self, i, j):
-        """Scambia gli elementi in posizione i e j."""
-        self.data[i], self.data[j] = self.data[j], self.data[i]
+        """Scambia gli elementi in posizione i e j (in tutti gli array)."""
+        data, items, seqs = self.data, self.items, self.seqs
+        data[i], data[j] = data[j], data[i]
+        items[i], items[j] = items[j], items[i]
+        seqs[i], seqs[j] = seqs[j], seqs[i]
+
+    # heapify_up e heapify_down sono i cicli più eseguiti: il confronto
+    # (priorità maggiore oppure, a parità, seq minore) e il calcolo degli
+    # indici sono scritti in linea sugli array locali, per evitare
+    # una chiamata di metodo per ogni confronto.
 
     def _heapify_up(self, i):
         """
         Ripristina la proprietà di max-heap risalendo l'albero.
         Usato dopo l'inserimento.
-        Finché il nodo è maggiore del padre, lo scambiamo verso l'alto.
+        Invece di scambiare il nodo con il padre a ogni passo, lo tiene da
+        parte e fa scendere di un livello i padri più piccoli ("buco" che
+        risale); il nodo viene scritto una volta sola nella posizione finale.
         """
+        data, items, seqs = self.data, self.items, self.seqs
+        key, item, seq = data[i], items[i], seqs[i]
         while i > 0:
-            p = self._parent(i)
-            if self.data[i] > self.data[p]:
-                self._swap(i, p)
+            p = (i - 1) // 2
+            pk = data[p]
+            if key > pk or (key == pk and seq < seqs[p]):
+                data[i], items[i], seqs[i] = pk, items[p], seqs[p]
                 i = p
             else:
                 break  # proprietà dell'heap ristabilita
+        data[i], items[i], seqs[i] = key, item, seq
 
     def _heapify_down(self, i):
         """
         Ripristina la proprietà di max-heap scendendo nell'albero.
-        Usato dopo extract_max.
-        Confronta il nodo con i suoi figli e lo sposta verso il più grande.
+        Usato dopo extract_max e nella costruzione bottom-up.
+        Come in heapify_up, il nodo viene tenuto da parte: a ogni livello
+        il figlio più grande sale di un posto se è maggiore del nodo, e il
+        nodo viene scritto una volta sola nella posizione finale.
         """
-        n = self.size()
+        data, items, seqs = self.data, self.items, self.seqs
+        n = len(data)
+        key, item, seq = data[i], items[i], seqs[i]
         while True:
-            left = self._left(i)
-            right = self._right(i)
-            largest = i  # assume che il nodo corrente sia il più grande
-
-            # controlla figlio sinistro
-            if left < n and self.data[left] > self.data[largest]:
-                largest = left
-
-            # controlla figlio destro
-            if right < n and self.data[right] > self.data[largest]:
-                largest = right
-
-            # se un figlio è più grande, scambia
-            if largest != i:
-                self._swap(i, largest)
-                i = largest
+            child = 2 * i + 1
+            if child >= n:
+                break
+
+            # sceglie il figlio più grande (a parità, quello con seq minore)
+            right = child + 1
+            if right < n and (data[right] > data[child] or
+                              (data[right] == data[child] and seqs[right] < seqs[child])):
+                child = right
+
+            # se il figlio è più grande del nodo, sale di un livello
+            ck = data[child]
+            if ck > key or (ck == key and seqs[child] < seq):
+                data[i], items[i], seqs[i] = ck, items[child], seqs[child]
+                i = child
             else:
                 break  # l'heap è corretto
+        data[i], items[i], seqs[i] = key, item, seq
@@ -0,0 +1,83 @@
+# linked_list_node.py
+#
+# Nodo condiviso dalle due code basate su lista concatenata
+# (LinkedListPriorityQueue e SortedLinkedListPriorityQueue) e pool di nodi
+# riutilizzabili.
+#
+# Il nodo usa __slots__: gli attributi stanno in posizioni fisse
+# dell'oggetto invece che in un dizionario per istanza (__dict__).
+# Ogni nodo occupa così 56 byte invece di circa 96 (CPython 3.11; nelle
+# versioni precedenti, con il dizionario sempre allocato, oltre 150),
+# e la creazione del nodo è più veloce.
+#
+# NodePool è una "free list": i nodi estratti o rimossi vengono tenuti da
+# parte e riutilizzati dalle insert successive, invece di essere liberati e
+# riallocati. È utile nei carichi stazionari (hold model: ogni extract_max
+# è seguita da una insert), dove il numero di nodi vivi resta costante.
+# In CPython l'allocatore degli oggetti piccoli ha già delle liste libere,
+# quindi il guadagno è modesto e si vede solo con code piccole, dove
+# l'allocazione pesa più della scansione (vedi benchmarks.py --bench nodes).
+#
+# ATTENZIONE: con un pool, il nodo restituito da insert (l'handle) resta
+# valido solo finché l'elemento è nella coda. Dopo extract_max o remove il
+# nodo può essere riutilizzato per un altro elemento: un handle vecchio
+# passato a remove cancellerebbe quell'altro elemento.
+
+
+from priority_queue_base import _NO_ITEM
+
+
+class Node:
+    """
+    Nodo della lista concatenata.
+    - key  = priorità (l'unico valore confrontato)
+    - next = puntatore al nodo successivo (o None)
+    - item = item associato (se non indicato, la chiave stessa)
+    """
+    __slots__ = ("key", "next", "item")
+
+    def __init__(self, key, next=None, item=_NO_ITEM):
+        self.key = key
+        self.next = next
+        self.item = key if item is _NO_ITEM else item
+
+
+class NodePool:
+    """
+    Pool di nodi liberi, collegati tra loro tramite il campo next
+    (nessuna struttura aggiuntiva). Può essere condiviso da più code.
+    """
+
+    def __init__(self, max_size=None):
+        """
+        max_size: numero massimo di nodi tenuti nel pool
+                  (None = nessun limite); i nodi in eccesso vengono liberati.
+        """
+        self.max_size = max_size
+        self._free = None   # testa della lista dei nodi liberi
+        self.n = 0          # nodi attualmente nel pool
+
+    def acquire(self, key, next=None, item=_NO_ITEM):
+        """Restituisce un nodo inizializzato, riusandone uno libero se c'è."""
+        node = self._free
+        if node is None:
+            return Node(key, next, item)
+        self._free = node.next
+        self.n -= 1
+        node.key = key
+        node.next = next
+        node.item = key if item is _NO_ITEM else item
+        return node
+
+    def release(self, node):
+        """
+        Restituisce al pool un nodo già scollegato dalla coda.
+        Chiave e item vengono azzerati, per non tenere vivi gli oggetti.
+        """
+        if self.max_size is not None and self.n >= self.max_size:
+            return
+        node.key = None
+        node.item = None
+        node.next = self._free
+        self._free = node
+        self.n += 1
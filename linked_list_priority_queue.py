@@ -6,43 +6,46 @@
 # - Insert: O(1) perché inseriamo sempre in testa.
 # - Peek (trovare il massimo): O(n) perché dobbiamo scorrere tutta la lista.
 # - Extract_max: O(n) perché dobbiamo cercare il massimo e poi rimuoverlo.
+# - Remove: O(n) per trovare il nodo (o il suo predecessore), poi lo si
+#   scollega direttamente. Il nodo restituito da insert fa da handle.
 #
 # Questa implementazione è molto efficiente per molte "insert"
 # ma inefficiente per molte "extract_max".
+#
+# Poiché si inserisce in testa, a parità di priorità il nodo inserito per
+# primo è quello più vicino alla CODA della lista: la ricerca del massimo
+# usa ">=" per fermarsi sull'ultimo dei massimi (ordine FIFO).
+#
+# I nodi (Node, con __slots__) sono definiti in linked_list_node.py; con un
+# NodePool i nodi estratti vengono riutilizzati dalle insert successive.
 
 
-from priority_queue_base import PriorityQueue
-
-
-class Node:
-    """
-    Un nodo della lista concatenata.
-    Contiene:
-    - key  = valore (intero) memorizzato
-    - next = puntatore al nodo successivo (o None)
-    """
-
-    def __init__(self, key, next=None):
-        self.key = key
-        self.next = next
+from priority_queue_base import PriorityQueue, _NO_ITEM
+from linked_list_node import Node
+from snapshot import check_keys_only, write_snapshot, read_snapshot
 
 
 class LinkedListPriorityQueue(PriorityQueue):
 
-    def __init__(self):
+    def __init__(self, key=None, pool=None):
         """
         Inizializza una lista concatenata vuota.
         head → None
         n = numero di elementi
+        key = funzione opzionale per calcolare la priorità
+        pool = NodePool opzionale da cui prendere (e a cui restituire) i nodi;
+               con un pool gli handle diventano invalidi dopo extract_max/remove
         """
+        super().__init__(key)
         self.head = None
         self.n = 0
+        self.pool = pool
 
     def size(self):
         """Restituisce il numero di elementi presenti nella struttura."""
         return self.n
 
-    def insert(self, key):
+    def insert(self, key, item=_NO_ITEM):
         """
         Inserisce un nuovo elemento in TESTA alla lista.
 
@@ -50,14 +53,21 @@ class LinkedListPriorityQueue(PriorityQueue):
         Perché:
         - creiamo un nodo
         - il nuovo nodo diventa il nuovo head
+
+        Restituisce il nodo creato, utilizzabile come handle per remove.
         """
-        new_node = Node(key, self.head)
+        key, item = self._entry(key, item)
+        if self.pool is None:
+            new_node = Node(key, self.head, item)
+        else:
+            new_node = self.pool.acquire(key, self.head, item)
         self.head = new_node
         self.n += 1
+        return new_node
 
     def peek(self):
         """
-        Restituisce il valore massimo SENZA rimuoverlo.
+        Restituisce l'item massimo SENZA rimuoverlo.
 
         Complessità: O(n)
         Perché dobbiamo scorrere tutta la lista
@@ -66,57 +76,134 @@ class LinkedListPriorityQueue(PriorityQueue):
         if self.head is None:
             raise IndexError("peek from empty list")
 
-        current = self.head
-        max_val = current.key
-
-        # Scandisci tutta la lista e cerca il valore massimo
-        while current is not None:
-            if current.key > max_val:
-                max_val = current.key
-            current = current.next
-
-        return max_val
+        _, best = self._find_max()
+        return best.item
 
     def extract_max(self):
         """
-        Rimuove e restituisce l'elemento con valore massimo.
+        Rimuove e restituisce l'item con priorità massima.
 
         Strategia:
-        1. Usiamo 'peek' per trovare il valore massimo → O(n)
-        2. Scorriamo la lista una seconda volta per rimuovere
-           il primo nodo che contiene tale valore → O(n)
+        1. Una sola passata trova il nodo massimo e il suo predecessore → O(n)
+        2. Il nodo viene scollegato direttamente → O(1)
 
         Complessità totale: O(n)
-        (Due passate separate, ma sempre O(n))
         """
         if self.head is None:
             raise IndexError("extract_max from empty list")
 
-        # Primo passaggio: individua il valore massimo
-        max_val = self.peek()
+        prev, best = self._find_max()
 
-        # Secondo passaggio: trova e rimuovi il nodo con quel valore
-        current = self.head
-        prev = None
+        # Caso 1: il massimo è in testa
+        if prev is None:
+            self.head = best.next
+        else:
+            # Caso 2: il massimo è in mezzo/in fondo
+            prev.next = best.next
 
-        while current is not None:
-            # Quando troviamo il nodo contenente max_val...
-            if current.key == max_val:
+        self.n -= 1
+        max_item = best.item
+        if self.pool is not None:
+            self.pool.release(best)
+        return max_item
 
-                # Caso 1: il massimo è in testa
+    def remove(self, key_or_handle):
+        """
+        Rimuove un nodo dalla lista:
+        - se riceve un Node (restituito da insert), rimuove proprio quel nodo
+        - altrimenti rimuove il primo nodo il cui item è uguale alla chiave
+
+        Una sola passata trova il nodo e il suo predecessore,
+        poi il nodo viene scollegato direttamente.
+        Complessità: O(n)
+        """
+        by_handle = isinstance(key_or_handle, Node)
+
+        prev = None
+        current = self.head
+        while current is not None:
+            if (current is key_or_handle) if by_handle else (current.item == key_or_handle):
                 if prev is None:
                     self.head = current.next
                 else:
-                    # Caso 2: il massimo è in mezzo/in fondo
                     prev.next = current.next
-
                 self.n -= 1
-                return max_val
+                if self.pool is not None:
+                    self.pool.release(current)
+                return
+            prev = current
+            current = current.next
+
+        raise ValueError("item not in list")
+
+    @classmethod
+    def from_keys(cls, keys, items=None):
+        """
+        Costruisce la lista inserendo ogni chiave in testa,
+        senza passare per insert.
 
-            # Avanza nella lista
+        Complessità: O(n)
+        """
+        pq = cls()
+        head = None
+        n = 0
+        if items is None:
+            for k in keys:
+                head = Node(k, head)
+                n += 1
+        else:
+            for k, it in zip(keys, items):
+                head = Node(k, head, it)
+                n += 1
+        pq.head = head
+        pq.n = n
+        return pq
+
+    def dump(self, fileobj):
+        """
+        Salva le chiavi in ordine di inserimento (dalla coda alla testa),
+        così load può ricostruire la lista con from_keys.
+        Scansione iterativa: nessun limite di ricorsione, a differenza di pickle.
+        Complessità: O(n)
+        """
+        keys = []
+        items = []
+        current = self.head
+        while current is not None:
+            keys.append(current.key)
+            items.append(current.item)
+            current = current.next
+        check_keys_only(keys, items, self.keyfunc)
+        keys.reverse()
+        write_snapshot(fileobj, keys)
+
+    @classmethod
+    def load(cls, fileobj):
+        """Ricostruisce la lista con from_keys. Complessità: O(n)"""
+        keys, _ = read_snapshot(fileobj)
+        return cls.from_keys(keys)
+
+    # -------------------------------------------------------------------
+    # METODI INTERNI (helper)
+    # -------------------------------------------------------------------
+
+    def _find_max(self):
+        """
+        Scandisce tutta la lista e restituisce (prev, best):
+        - best = nodo con priorità massima (a parità, il più vecchio,
+                 cioè l'ultimo incontrato: per questo si usa >=)
+        - prev = nodo che lo precede (None se best è la testa)
+        """
+        best_prev = None
+        best = self.head
+        prev = self.head
+        current = self.head.next
+
+        while current is not None:
+            if current.key >= best.key:
+                best_prev = prev
+                best = current
             prev = current
             current = current.next
 
-        # Se arriviamo qui significa che c'è un problema logico,
-        # perché max_val dovrebbe sempre essere trovato.
-        raise RuntimeError("unexpected error in extract_max")
+        return best_prev, best
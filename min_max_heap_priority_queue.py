@@ -0,0 +1,279 @@
+# min_max_heap_priority_queue.py
+#
+# Coda di priorità DOPPIA (double-ended) basata su un min-max heap.
+#
+# Un min-max heap è un albero binario completo memorizzato in un array
+# (come il max-heap di heap_priority_queue.py) in cui i livelli si alternano:
+# - livelli PARI (0, 2, 4, ...)   → livelli "min": ogni nodo è <= di tutti
+#                                    i suoi discendenti
+# - livelli DISPARI (1, 3, 5, ...) → livelli "max": ogni nodo è >= di tutti
+#                                    i suoi discendenti
+# Quindi il minimo è sempre la radice e il massimo è uno dei suoi due figli.
+#
+# Con un solo array si ottengono sia il massimo sia il minimo, senza tenere
+# due code speculari (doppia memoria e doppio costo di insert).
+#
+# Gli elementi sono memorizzati negli stessi array paralleli dell'heap binario
+# (data = priorità, items = payload, seqs = ordine di inserimento).
+# L'ordine totale usato è:
+#   a "più alto" di b  ⇔  priorità maggiore oppure, a parità, inserito prima
+# quindi extract_max rispetta l'ordine FIFO a parità di priorità, ed
+# extract_min restituisce l'elemento che extract_max restituirebbe per ultimo.
+#
+# Complessità:
+#   insert                  = O(log n)
+#   extract_max/extract_min = O(log n)
+#   peek_max/peek_min       = O(1)
+#   from_keys               = O(n)
+#   remove                  = O(n) per la ricerca + O(log n)
+#   dump / load             = O(n)
+
+
+from priority_queue_base import PriorityQueue, _NO_ITEM
+from snapshot import check_keys_only, write_snapshot, read_snapshot
+
+
+class MinMaxHeapPriorityQueue(PriorityQueue):
+
+    def __init__(self, key=None):
+        super().__init__(key)
+        # Array paralleli: priorità, item, numeri di inserimento
+        self.data = []
+        self.items = []
+        self.seqs = []
+
+        # Prossimo numero progressivo di inserimento
+        self._seq = 0
+
+    def size(self):
+        """Restituisce il numero di elementi presenti nell'heap."""
+        return len(self.data)
+
+    def insert(self, key, item=_NO_ITEM):
+        """
+        Inserisce un nuovo elemento:
+        1. lo aggiunge in fondo agli array
+        2. lo fa risalire con push_up, confrontandolo con il padre
+           (per capire se appartiene alla parte min o max) e poi con i nonni
+        Complessità: O(log n)
+        """
+        key, item = self._entry(key, item)
+
+        self.data.append(key)
+        self.items.append(item)
+        self.seqs.append(self._seq)
+        self._seq += 1
+
+        self._push_up(self.size() - 1)
+
+    def peek_min(self):
+        """Restituisce l'item minimo (la radice) senza rimuoverlo. O(1)"""
+        if self.size() == 0:
+            raise IndexError("peek_min from empty min-max heap")
+        return self.items[0]
+
+    def peek_max(self):
+        """Restituisce l'item massimo senza rimuoverlo. O(1)"""
+        if self.size() == 0:
+            raise IndexError("peek_max from empty min-max heap")
+        return self.items[self._max_index()]
+
+    def peek(self):
+        """Come peek_max: interfaccia PriorityQueue."""
+        return self.peek_max()
+
+    def extract_min(self):
+        """Rimuove e restituisce l'item minimo. O(log n)"""
+        if self.size() == 0:
+            raise IndexError("extract_min from empty min-max heap")
+        return self._remove_at(0)
+
+    def extract_max(self):
+        """Rimuove e restituisce l'item massimo. O(log n)"""
+        if self.size() == 0:
+            raise IndexError("extract_max from empty min-max heap")
+        return self._remove_at(self._max_index())
+
+    def remove(self, key_or_handle):
+        """
+        Rimuove il primo elemento (in ordine di array) il cui item è uguale
+        alla chiave: ricerca O(n), poi rimozione in posizione O(log n).
+        """
+        for i, it in enumerate(self.items):
+            if it == key_or_handle:
+                self._remove_at(i)
+                return
+        raise ValueError("item not in min-max heap")
+
+    @classmethod
+    def from_keys(cls, keys, items=None):
+        """
+        Costruisce il min-max heap bottom-up: applica push_down a tutti i
+        nodi interni, dall'ultimo alla radice.
+        Complessità: O(n)
+        """
+        pq = cls()
+        pq.data = list(keys)
+        pq.items = list(pq.data if items is None else items)
+        pq.seqs = list(range(pq.size()))
+        pq._seq = pq.size()
+        for i in range(pq.size() // 2 - 1, -1, -1):
+            pq._push_down(i)
+        return pq
+
+    def dump(self, fileobj):
+        """Salva l'array del min-max heap. O(n)"""
+        check_keys_only(self.data, self.items, self.keyfunc)
+        write_snapshot(fileobj, self.data)
+
+    @classmethod
+    def load(cls, fileobj):
+        """
+        Ricostruisce il min-max heap con from_keys (bottom-up, O(n)).
+        A differenza del max-heap l'array non si può adottare così com'è:
+        con i numeri di inserimento presi dagli indici, a parità di priorità
+        un livello min risulterebbe "più alto" dei suoi discendenti.
+        """
+        keys, _ = read_snapshot(fileobj)
+        return cls.from_keys(keys)
+
+    # -------------------------------------------------------------------
+    # METODI INTERNI (helper)
+    # -------------------------------------------------------------------
+
+    def _is_min_level(self, i):
+        """True se il nodo i si trova su un livello min (profondità pari)."""
+        return ((i + 1).bit_length() - 1) % 2 == 0
+
+    def _less(self, i, j):
+        """
+        True se l'elemento in i è "più basso" di quello in j:
+        priorità minore oppure, a parità, inserito dopo.
+        """
+        a, b = self.data[i], self.data[j]
+        return a < b or (a == b and self.seqs[i] > self.seqs[j])
+
+    def _swap(self, i, j):
+        """Scambia gli elementi in posizione i e j (in tutti gli array)."""
+        data, items, seqs = self.data, self.items, self.seqs
+        data[i], data[j] = data[j], data[i]
+        items[i], items[j] = items[j], items[i]
+        seqs[i], seqs[j] = seqs[j], seqs[i]
+
+    def _max_index(self):
+        """Indice del massimo: la radice se è sola, altrimenti uno dei figli."""
+        n = self.size()
+        if n == 1:
+            return 0
+        if n == 2:
+            return 1
+        return 2 if self._less(1, 2) else 1
+
+    def _remove_at(self, i):
+        """
+        Rimuove l'elemento in posizione i: lo scambia con l'ultimo,
+        accorcia gli array e ripristina la proprietà:
+        1. push_up: l'elemento spostato potrebbe violare l'ordine con gli
+           antenati (per la radice o i suoi figli non fa nulla)
+        2. push_down: l'elemento che ora sta in i (quello spostato, o
+           l'antenato con cui è stato scambiato) va sistemato nel sottoalbero
+        """
+        last = self.size() - 1
+        if i != last:
+            self._swap(i, last)
+
+        self.data.pop()
+        self.seqs.pop()
+        item = self.items.pop()
+
+        if i < last:
+            self._push_up(i)
+            self._push_down(i)
+        return item
+
+    def _push_up(self, i):
+        """
+        Fa risalire il nodo i dopo un inserimento.
+        Se sta su un livello min ma è più alto del padre (che è su un
+        livello max), va nella parte max: scambio e risalita tra i max.
+        Simmetricamente per i livelli max.
+        """
+        if i == 0:
+            return
+        p = (i - 1) // 2
+        if self._is_min_level(i):
+            if self._less(p, i):
+                self._swap(i, p)
+                self._push_up_along(p, is_max=True)
+            else:
+                self._push_up_along(i, is_max=False)
+        else:
+            if self._less(i, p):
+                self._swap(i, p)
+                self._push_up_along(p, is_max=False)
+            else:
+                self._push_up_along(i, is_max=True)
+
+    # push_up_along e push_down sono i cicli più eseguiti: come in
+    # heap_priority_queue.py il confronto di _less è scritto in linea
+    # sugli array locali, per evitare una chiamata di metodo per confronto.
+    # Per i livelli max si confrontano gli elementi a ruoli invertiti.
+
+    def _push_up_along(self, i, is_max):
+        """
+        Risale saltando di due livelli alla volta (nonno), finché il nodo
+        è più alto (is_max) o più basso (not is_max) del nonno.
+        """
+        data, seqs = self.data, self.seqs
+        while i > 2:
+            g = ((i - 1) // 2 - 1) // 2
+            a, b = (g, i) if is_max else (i, g)
+            if data[a] < data[b] or (data[a] == data[b] and seqs[a] > seqs[b]):
+                self._swap(i, g)
+                i = g
+            else:
+                break
+
+    def _push_down(self, i):
+        """
+        Fa scendere il nodo i: tra figli e nipoti sceglie il più basso
+        (livello min) o il più alto (livello max) e, se necessario, scambia.
+        Quando lo scambio avviene con un nipote, il nodo spostato va
+        confrontato anche con il nuovo padre (di tipo opposto).
+        """
+        data, seqs = self.data, self.seqs
+        is_max = not self._is_min_level(i)
+        n = len(data)
+
+        while True:
+            first_child = 2 * i + 1
+            if first_child >= n:
+                break
+
+            # Candidati: i due figli e i quattro nipoti.
+            # m = il più basso (livello min) o il più alto (livello max)
+            m = first_child
+            last = min(2 * first_child + 5, n)
+            for c in (first_child + 1, *range(2 * first_child + 1, last)):
+                if c >= n:
+                    break
+                a, b = (m, c) if is_max else (c, m)
+                if data[a] < data[b] or (data[a] == data[b] and seqs[a] > seqs[b]):
+                    m = c
+
+            a, b = (i, m) if is_max else (m, i)
+            if not (data[a] < data[b] or (data[a] == data[b] and seqs[a] > seqs[b])):
+                break
+
+            self._swap(i, m)
+
+            # m è un figlio: dopo lo scambio la proprietà vale
+            if m <= first_child + 1:
+                break
+
+            # m è un nipote: controlla il padre di m (livello opposto)
+            p = (m - 1) // 2
+            a, b = (m, p) if is_max else (p, m)
+            if data[a] < data[b] or (data[a] == data[b] and seqs[a] > seqs[b]):
+                self._swap(m, p)
+            i = m
@@ -0,0 +1,263 @@
+# persistent_priority_queue.py
+#
+# Coda di priorità PERSISTENTE (immutabile) basata su un leftist heap.
+#
+# Ogni operazione che modifica la coda restituisce una NUOVA versione e
+# lascia intatta quella vecchia. Le versioni condividono i nodi non toccati
+# (structural sharing): insert ed extract_max copiano solo i nodi lungo un
+# cammino di lunghezza O(log n), quindi una "copia" della coda (fork) costa
+# O(1): basta tenere un riferimento alla versione corrente.
+#
+# Leftist heap (max-heap):
+# - ogni nodo è più alto dei figli (priorità maggiore oppure, a parità,
+#   inserito prima: ordine FIFO come nelle altre implementazioni)
+# - rank(nodo) = lunghezza del cammino più a destra fino a un nodo vuoto;
+#   per ogni nodo rank(figlio sinistro) >= rank(figlio destro)
+#   → il cammino destro ha al più log2(n + 1) nodi
+# - tutte le operazioni si riducono a merge, che scende solo lungo i
+#   cammini destri dei due heap: O(log n)
+#
+# I nodi sono tuple (immutabili per costruzione, compatte e veloci da creare):
+#     (key, seq, item, rank, left, right)
+#
+# Il modulo contiene:
+# - PersistentHeap: il valore immutabile (una versione)
+# - PersistentPriorityQueue: facciata mutabile con l'interfaccia
+#   PriorityQueue, che sostituisce la propria versione a ogni operazione
+#   e offre fork() in O(1)
+#
+# Complessità:
+#   insert      = O(log n)
+#   extract_max = O(log n)
+#   peek        = O(1)
+#   fork        = O(1)
+#   from_keys   = O(n)   (merge a coppie)
+#   remove      = O(n) per la ricerca + copia del cammino fino al nodo
+
+
+from priority_queue_base import PriorityQueue, _NO_ITEM
+from snapshot import check_keys_only, write_snapshot, read_snapshot
+
+
+# Indici dei campi di un nodo
+_KEY, _SEQ, _ITEM, _RANK, _LEFT, _RIGHT = range(6)
+
+
+def _rank(node):
+    """rank di un nodo (0 per il nodo vuoto)."""
+    return 0 if node is None else node[_RANK]
+
+
+def _make(node, a, b):
+    """
+    Nuovo nodo con gli stessi dati di 'node' e figli a, b: il figlio con
+    rank maggiore va a sinistra (proprietà leftist).
+    """
+    ra, rb = _rank(a), _rank(b)
+    if ra < rb:
+        a, b, rb = b, a, ra
+    return (node[_KEY], node[_SEQ], node[_ITEM], rb + 1, a, b)
+
+
+def _merge(a, b):
+    """
+    Fonde due leftist heap senza modificarli: la radice più alta resta
+    radice e il suo sottoalbero destro viene fuso con l'altro heap.
+    La ricorsione scende solo lungo i cammini destri: profondità O(log n).
+    """
+    if a is None:
+        return b
+    if b is None:
+        return a
+    # a deve essere il più alto (priorità maggiore o, a parità, seq minore)
+    if b[_KEY] > a[_KEY] or (b[_KEY] == a[_KEY] and b[_SEQ] < a[_SEQ]):
+        a, b = b, a
+    return _make(a, a[_LEFT], _merge(a[_RIGHT], b))
+
+
+def _remove(root, item):
+    """
+    Restituisce una nuova radice senza un nodo il cui item è uguale a
+    'item' (ValueError se non c'è).
+
+    La ricerca è iterativa (il cammino sinistro di un leftist heap può
+    essere lungo O(n), la ricorsione supererebbe il limite di Python);
+    poi il nodo viene sostituito dalla fusione dei suoi figli e gli
+    antenati vengono ricopiati risalendo fino alla radice.
+    """
+    parent = {}          # id(nodo) → (padre, lato)
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node[_ITEM] == item:
+            break
+        for side in (_LEFT, _RIGHT):
+            child = node[side]
+            if child is not None:
+                parent[id(child)] = (node, side)
+                stack.append(child)
+    else:
+        raise ValueError("item not in persistent heap")
+
+    new = _merge(node[_LEFT], node[_RIGHT])
+    while id(node) in parent:
+        p, side = parent[id(node)]
+        if side == _LEFT:
+            new = _make(p, new, p[_RIGHT])
+        else:
+            new = _make(p, p[_LEFT], new)
+        node = p
+    return new
+
+
+class PersistentHeap:
+    """
+    Una versione immutabile della coda. Le operazioni che la modificano
+    restituiscono una nuova PersistentHeap; quella corrente resta valida.
+
+    EMPTY è la versione vuota; le versioni si costruiscono da lì:
+        v1 = PersistentHeap.EMPTY.insert(5)
+        item, v2 = v1.extract_max()
+    """
+    __slots__ = ("root", "n", "next_seq")
+
+    def __init__(self, root=None, n=0, next_seq=0):
+        self.root = root
+        self.n = n
+        # numero di inserimento per la prossima insert (ordine FIFO)
+        self.next_seq = next_seq
+
+    def size(self):
+        """Restituisce il numero di elementi della versione."""
+        return self.n
+
+    def peek(self):
+        """Restituisce l'item massimo. O(1)"""
+        if self.root is None:
+            raise IndexError("peek from empty persistent heap")
+        return self.root[_ITEM]
+
+    def insert(self, key, item=_NO_ITEM):
+        """
+        Restituisce una nuova versione con l'elemento aggiunto
+        (senza item → l'item è la chiave). O(log n)
+        """
+        node = (key, self.next_seq, key if item is _NO_ITEM else item, 1, None, None)
+        return PersistentHeap(_merge(self.root, node), self.n + 1, self.next_seq + 1)
+
+    def extract_max(self):
+        """
+        Restituisce (item massimo, nuova versione senza di esso).
+        La nuova radice è la fusione dei due figli. O(log n)
+        """
+        root = self.root
+        if root is None:
+            raise IndexError("extract_max from empty persistent heap")
+        return root[_ITEM], PersistentHeap(_merge(root[_LEFT], root[_RIGHT]),
+                                           self.n - 1, self.next_seq)
+
+    def remove(self, item):
+        """Restituisce una nuova versione senza un elemento con questo item."""
+        if self.root is None:
+            raise ValueError("item not in persistent heap")
+        return PersistentHeap(_remove(self.root, item), self.n - 1, self.next_seq)
+
+    def entries(self):
+        """
+        Restituisce (keys, items) in ordine di inserimento (seq), per la
+        ricostruzione o il salvataggio. Visita iterativa. O(n log n)
+        """
+        nodes = []
+        stack = [] if self.root is None else [self.root]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            if node[_LEFT] is not None:
+                stack.append(node[_LEFT])
+            if node[_RIGHT] is not None:
+                stack.append(node[_RIGHT])
+        nodes.sort(key=lambda node: node[_SEQ])
+        return [node[_KEY] for node in nodes], [node[_ITEM] for node in nodes]
+
+    @classmethod
+    def from_keys(cls, keys, items=None):
+        """
+        Costruisce una versione con tutte le chiavi fondendo gli heap a
+        coppie, come in una costruzione bottom-up: O(n).
+        """
+        keys = list(keys)
+        items = keys if items is None else list(items)
+        heaps = [(k, seq, it, 1, None, None)
+                 for seq, (k, it) in enumerate(zip(keys, items))]
+        while len(heaps) > 1:
+            merged = [_merge(heaps[i], heaps[i + 1])
+                      for i in range(0, len(heaps) - 1, 2)]
+            if len(heaps) % 2:
+                merged.append(heaps[-1])
+            heaps = merged
+        return cls(heaps[0] if heaps else None, len(keys), len(keys))
+
+
+# Versione vuota condivisa da tutte le code
+PersistentHeap.EMPTY = PersistentHeap()
+
+
+class PersistentPriorityQueue(PriorityQueue):
+    """
+    Facciata mutabile su PersistentHeap: implementa l'interfaccia
+    PriorityQueue sostituendo a ogni operazione la versione corrente.
+
+    fork() restituisce una coda indipendente in O(1): le due code
+    condividono tutti i nodi finché non vengono modificate, e ognuna
+    copia solo i nodi del cammino che modifica.
+    """
+
+    def __init__(self, key=None, version=None):
+        super().__init__(key)
+        self.version = PersistentHeap.EMPTY if version is None else version
+
+    def size(self):
+        """Restituisce il numero di elementi presenti."""
+        return self.version.n
+
+    def peek(self):
+        """Restituisce l'item massimo senza rimuoverlo. O(1)"""
+        return self.version.peek()
+
+    def insert(self, key, item=_NO_ITEM):
+        """Inserisce un elemento creando una nuova versione. O(log n)"""
+        key, item = self._entry(key, item)
+        self.version = self.version.insert(key, item)
+
+    def extract_max(self):
+        """Rimuove e restituisce l'item massimo. O(log n)"""
+        item, self.version = self.version.extract_max()
+        return item
+
+    def remove(self, key_or_handle):
+        """
+        Rimuove un elemento il cui item è uguale alla chiave.
+        Le altre code ottenute con fork non vengono toccate.
+        """
+        self.version = self.version.remove(key_or_handle)
+
+    def fork(self):
+        """Restituisce una copia indipendente della coda. O(1)"""
+        return PersistentPriorityQueue(self.keyfunc, self.version)
+
+    @classmethod
+    def from_keys(cls, keys, items=None):
+        """Costruzione in blocco con PersistentHeap.from_keys. O(n)"""
+        return cls(version=PersistentHeap.from_keys(keys, items))
+
+    def dump(self, fileobj):
+        """Salva le chiavi in ordine di inserimento. O(n log n)"""
+        keys, items = self.version.entries()
+        check_keys_only(keys, items, self.keyfunc)
+        write_snapshot(fileobj, keys)
+
+    @classmethod
+    def load(cls, fileobj):
+        """Ricostruisce la coda con from_keys. O(n)"""
+        keys, _ = read_snapshot(fileobj)
+        return cls.from_keys(keys)
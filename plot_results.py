@@ -9,12 +9,16 @@
 #   - osservare trend al variare della dimensione n
 #
 # Viene usata matplotlib per generare line plot.
+# I fit di complessità sono calcolati in analysis.py.
 
 
 import os
 import csv
+import math
 import matplotlib.pyplot as plt
 
+from analysis import MODELS, index_aggregated, analyze
+
 
 def read_aggregated(path):
     """
@@ -46,7 +50,7 @@ def read_aggregated(path):
     return data
 
 
-def plot_by_operation(data, operation, outdir="results/plots"):
+def plot_by_operation(index, operation, outdir="results/plots"):
     """
     Genera un grafico per una determinata operazione:
         - "insert"
@@ -61,7 +65,8 @@ def plot_by_operation(data, operation, outdir="results/plots"):
     - Una curva per ogni implementazione (heap, linked_list, sorted_list)
 
     Parametri:
-    - data: risultati aggregati (lista di dict)
+    - index: indice dei risultati (vedi analysis.index_aggregated),
+             le serie sono già ordinate per n
     - operation: string ("insert" oppure "extract_all")
     - outdir: cartella dove salvare i PNG
     """
@@ -70,31 +75,24 @@ def plot_by_operation(data, operation, outdir="results/plots"):
     os.makedirs(outdir, exist_ok=True)
 
     # Filtriamo le casistiche
-    cases = sorted(set(d['case'] for d in data if d['operation'] == operation))
-    impls = sorted(set(d['impl'] for d in data if d['operation'] == operation))
+    cases = sorted(set(c for (op, c, _) in index if op == operation))
+    impls = sorted(set(i for (op, _, i) in index if op == operation))
 
     for case in cases:
         # Apriamo un nuovo grafico
         plt.figure(figsize=(8, 5))
 
         for impl in impls:
-            xs = []  # valori di n
-            ys = []  # mediane dei tempi in millisecondi
-
-            # Ordiniamo i dati per n (altrimenti la curva sarebbe disordinata)
-            for d in sorted(data, key=lambda r: int(r['n'])):
-                if (
-                    d['operation'] == operation
-                    and d['case'] == case
-                    and d['impl'] == impl
-                ):
-                    xs.append(int(d['n']))
-                    # Convertiamo secondi → millisecondi
-                    ys.append(float(d['median_s']) * 1000.0)
-
-            if xs:
-                # Disegniamo la curva
-                plt.plot(xs, ys, marker='o', label=impl)
+            series = index.get((operation, case, impl))
+            if series is None:
+                continue
+
+            xs, ts = series
+            # Convertiamo secondi → millisecondi
+            ys = [t * 1000.0 for t in ts]
+
+            # Disegniamo la curva
+            plt.plot(xs, ys, marker='o', label=impl)
 
         # Titoli e assi
         plt.xlabel("n (number of elements)")
@@ -111,6 +109,57 @@ def plot_by_operation(data, operation, outdir="results/plots"):
         print("Saved", outfile)
 
 
+def plot_fits(index, fits, operation, outdir="results/plots"):
+    """
+    Genera grafici log-log con i punti misurati e le curve stimate
+    (vedi analysis.analyze) sovrapposte:
+    - linea continua: retta di regressione log-log (pendenza in legenda)
+    - linea tratteggiata: modello migliore tra n, n log n, n²
+
+    Un grafico per ogni caso, salvato come <operation>_<case>_fit.png.
+    """
+
+    os.makedirs(outdir, exist_ok=True)
+
+    cases = sorted(set(c for (op, c, _) in fits if op == operation))
+
+    for case in cases:
+        plt.figure(figsize=(8, 5))
+
+        for key in sorted(k for k in fits if k[0] == operation and k[1] == case):
+            impl = key[2]
+            xs, ts = index[key]
+            ll = fits[key]["loglog"]
+            best = fits[key]["best"]
+
+            # Punti misurati
+            points = plt.loglog(xs, [t * 1000.0 for t in ts], marker='o', linestyle='none')
+            color = points[0].get_color()
+
+            # Retta log-log stimata
+            fitted = [math.exp(ll["intercept"]) * n ** ll["slope"] * 1000.0 for n in xs]
+            plt.loglog(xs, fitted, color=color,
+                       label=f"{impl}: slope {ll['slope']:.2f} ± {ll['slope_ci']:.2f}")
+
+            # Modello migliore
+            f = MODELS[best["model"]]
+            model = [best["c"] * f(n) * 1000.0 for n in xs]
+            plt.loglog(xs, model, color=color, linestyle='--',
+                       label=f"{impl}: {best['model']}")
+
+        plt.xlabel("n (number of elements)")
+        plt.ylabel("median time (ms)")
+        plt.title(f"{operation} - case: {case} (log-log fit)")
+        plt.legend(fontsize='small')
+        plt.grid(True, which='both')
+
+        outfile = os.path.join(outdir, f"{operation}_{case}_fit.png")
+        plt.savefig(outfile, bbox_inches='tight')
+        plt.close()
+
+        print("Saved", outfile)
+
+
 def main(agg_csv="results/aggregated_results.csv"):
     """
     Funzione principale:
@@ -118,13 +167,17 @@ def main(agg_csv="results/aggregated_results.csv"):
     - genera grafici per:
         * insert
         * extract_all
+      sia delle mediane grezze sia con le curve stimate (log-log)
     """
 
-    data = read_aggregated(agg_csv)
+    # Il CSV viene letto e indicizzato una sola volta
+    index = index_aggregated(read_aggregated(agg_csv))
+    fits = analyze(index)
 
     # Genera grafici per le due operazioni principali
-    plot_by_operation(data, operation="insert")
-    plot_by_operation(data, operation="extract_all")
+    for operation in ("insert", "extract_all"):
+        plot_by_operation(index, operation=operation)
+        plot_fits(index, fits, operation=operation)
 
 
 if __name__ == "__main__":
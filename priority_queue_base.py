@@ -1,5 +1,12 @@
 # priority_queue_base.py
 
+
+# Valore predefinito di 'item' in insert: indica "nessun payload"
+# (l'item è la chiave stessa). Non si usa None perché None è un payload
+# legittimo: insert(5, None) deve restituire None, non 5.
+_NO_ITEM = object()
+
+
 class PriorityQueue:
     """
     Classe base (interfaccia astratta) per tutte le implementazioni
@@ -8,19 +15,70 @@ class PriorityQueue:
     Non contiene logica, ma definisce i metodi che tutte le
     implementazioni concrete devono avere.
     In Python non abbiamo interfacce vere, ma usiamo questa tecnica.
+
+    Ogni elemento è una coppia (priorità, item):
+    - insert(key)             → priorità = key, item = key
+    - insert(priority, item)  → l'item è un dato qualsiasi (payload),
+                                che non viene mai confrontato
+    - con una funzione key=f  → insert(x) usa priorità = f(x), item = x
+    extract_max e peek restituiscono l'item.
+    A parità di priorità gli elementi escono in ordine di inserimento (FIFO).
+
+    Le implementazioni che lo supportano restituiscono da insert un
+    "handle", un riferimento all'elemento inserito che si può passare a
+    remove per cancellarlo senza cercarlo.
     """
 
-    def insert(self, key):
+    def __init__(self, key=None):
+        """
+        key: funzione opzionale che calcola la priorità di un elemento
+             (come il parametro key di sorted).
+        """
+        self.keyfunc = key
+
+    def _entry(self, key, item):
+        """
+        Restituisce la coppia (priorità, item) da memorizzare per
+        insert(key, item), applicando la funzione key se presente.
+        """
+        if self.keyfunc is not None:
+            if item is not _NO_ITEM:
+                raise TypeError("insert() takes a single element when key= is set")
+            return self.keyfunc(key), key
+        if item is _NO_ITEM:
+            return key, key
+        return key, item
+
+    def insert(self, key, item=_NO_ITEM):
         """
-        Inserisce un elemento con valore 'key' all'interno della coda di priorità.
+        Inserisce un elemento con priorità 'key' all'interno della coda di priorità.
+        Se 'item' non è indicato l'elemento memorizzato è la chiave stessa.
 
         Metodo astratto: deve essere implementato nelle sottoclassi.
         """
         raise NotImplementedError("Metodo non implementato")
 
+    def insert_many(self, keys, items=None):
+        """
+        Inserisce un blocco di elementi (ad esempio un lotto consegnato da
+        un produttore), con gli stessi argomenti di from_keys.
+        A parità di priorità l'ordine FIFO segue l'ordine di 'keys'.
+
+        Implementazione generica: una insert per chiave.
+        Le sottoclassi possono ridefinirla con un inserimento in blocco
+        più efficiente.
+        """
+        if items is None:
+            for k in keys:
+                self.insert(k)
+        else:
+            for k, it in zip(keys, items):
+                self.insert(k, it)
+
     def extract_max(self):
         """
-        Rimuove e restituisce il valore massimo contenuto nella coda di priorità.
+        Rimuove e restituisce l'item con priorità massima.
+        A parità di priorità restituisce il primo inserito.
 
         Metodo astratto: deve essere implementato nelle sottoclassi.
         """
@@ -28,14 +86,63 @@ class PriorityQueue:
 
     def peek(self):
         """
-        Restituisce il massimo senza rimuoverlo dalla struttura.
+        Restituisce l'item con priorità massima senza rimuoverlo dalla struttura.
 
         Utile per controllare l'elemento prioritario corrente.
         """
         raise NotImplementedError("Metodo non implementato")
 
+    def remove(self, key_or_handle):
+        """
+        Rimuove un elemento dalla coda (ad esempio un lavoro annullato):
+        - se riceve un handle restituito da insert, rimuove quell'elemento
+        - altrimenti rimuove un elemento il cui item è uguale a 'key_or_handle'
+
+        Solleva ValueError se l'elemento non è presente.
+        """
+        raise NotImplementedError("Metodo non implementato")
+
     def size(self):
         """
         Restituisce il numero di elementi attualmente presenti nella struttura.
         """
         raise NotImplementedError("Metodo non implementato")
+
+    def dump(self, fileobj):
+        """
+        Salva il contenuto della coda su un file binario (vedi snapshot.py):
+        header compatto + array tipizzato delle chiavi.
+        Supportato solo se ogni item è la chiave stessa (ValueError altrimenti).
+
+        Metodo astratto: deve essere implementato nelle sottoclassi.
+        """
+        raise NotImplementedError("Metodo non implementato")
+
+    @classmethod
+    def load(cls, fileobj):
+        """
+        Ricostruisce una coda da un file scritto con dump.
+
+        Metodo astratto: deve essere implementato nelle sottoclassi.
+        """
+        raise NotImplementedError("Metodo non implementato")
+
+    @classmethod
+    def from_keys(cls, keys, items=None):
+        """
+        Costruisce una nuova coda contenente tutte le chiavi 'keys'
+        (priorità, in ordine di inserimento) con gli item 'items'
+        (lista parallela; None → gli item sono le chiavi stesse).
+
+        Implementazione generica: una insert per chiave.
+        Le sottoclassi possono ridefinirla con una costruzione in blocco
+        più efficiente.
+        """
+        pq = cls()
+        if items is None:
+            for k in keys:
+                pq.insert(k)
+        else:
+            for k, it in zip(keys, items):
+                pq.insert(k, it)
+        return pq
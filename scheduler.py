@@ -0,0 +1,221 @@
+# scheduler.py
+#
+# Pianificazione dei test di performance con un BUDGET DI TEMPO.
+#
+# tests.main, senza budget, esegue ogni implementazione per ogni n: con le
+# implementazioni O(n²) (lista ordinata su input crescente, extract_max
+# della lista non ordinata) una sola configurazione con n grande può
+# richiedere ore.
+#
+# Lo scheduler assegna a ogni configurazione (caso, implementazione) un
+# budget in secondi per una ripetizione (insert + estrazioni) e:
+#   - PREVEDE il tempo della ripetizione al prossimo n estrapolando la
+#     crescita osservata sugli n già misurati (pendenza in scala log-log,
+#     vedi analysis.fit_loglog)
+#   - SALTA le configurazioni la cui previsione supera il budget
+#   - INTERROMPE (timeout) una ripetizione appena supera il budget, con un
+#     timer di sistema (signal.setitimer + SIGALRM, vedi time_limit): la
+#     configurazione viene censurata a quel n e saltata per gli n successivi.
+#     Dove il timer non esiste (Windows) il controllo avviene solo tra una
+#     ripetizione e l'altra (expired), come ripiego.
+# Le configurazioni saltate o interrotte vengono registrate nei CSV come
+# "censurate" (censored = True, tempo vuoto), con il motivo:
+#   - "timeout"   → una ripetizione è stata interrotta a quel n (misurato)
+#   - "predicted" → saltata a quel n solo per la previsione
+#   - "inherited" → censurata a un n più piccolo
+#
+# Una previsione è solo una stima: da un solo punto, o estrapolando molto
+# oltre l'ultimo n misurato, può sbagliare di un ordine di grandezza. Per
+# questo salta una configurazione solo una previsione AFFIDABILE (almeno due
+# misure, n non oltre MAX_EXTRAPOLATION volte l'ultimo n misurato); le altre
+# configurazioni oltre il budget vengono eseguite comunque sotto il timer,
+# che ne limita il costo a un budget.
+#
+# Ordine di esecuzione: gli n vengono eseguiti in ordine crescente, così ogni
+# previsione si basa su misure piccole ed economiche; a parità di n le
+# configurazioni vengono eseguite dalla più economica prevista, così le
+# misure utili arrivano per prime anche se l'esecuzione viene interrotta.
+
+
+import math
+import signal
+from contextlib import contextmanager
+
+from analysis import fit_loglog
+
+
+# Pendenza minima usata nell'estrapolazione: una ripetizione elabora n
+# elementi, quindi non può crescere meno che linearmente. Per n piccoli i
+# costi fissi fanno stimare pendenze < 1, che porterebbero a sottostimare.
+MIN_SLOPE = 1.0
+
+# Pendenza usata quando c'è una sola misura (nessun fit possibile):
+# prudente, come un'implementazione O(n²). Una previsione da un solo punto
+# serve solo a ordinare le configurazioni: non basta per saltarne una (una
+# O(n log n) verrebbe sovrastimata di un ordine di grandezza).
+SINGLE_POINT_SLOPE = 2.0
+
+# Rapporto massimo tra n e l'ultimo n misurato oltre il quale la previsione
+# non è considerata affidabile per saltare una configurazione
+MAX_EXTRAPOLATION = 4
+
+# True se la piattaforma ha un timer che può interrompere un test a metà
+HAS_TIMER = hasattr(signal, "setitimer")
+
+
+class RunTimeout(Exception):
+    """Sollevata da time_limit quando una ripetizione supera il budget."""
+
+
+@contextmanager
+def time_limit(seconds):
+    """
+    Interrompe il blocco con RunTimeout dopo 'seconds' secondi di tempo
+    reale (signal.setitimer + SIGALRM). Funziona solo nel thread
+    principale; dove il timer non esiste il blocco non viene interrotto.
+    """
+    if not HAS_TIMER:
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise RunTimeout()
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def predict_time(ns, ts, n, history=3):
+    """
+    Prevede il tempo per la dimensione 'n' dalle misure (ns, ts),
+    con ns crescente.
+
+    - nessuna misura  → None (impossibile prevedere)
+    - una misura      → pendenza SINGLE_POINT_SLOPE dall'ultimo punto
+    - più misure      → pendenza log-log sugli ultimi 'history' punti
+                        (almeno MIN_SLOPE), applicata a partire dall'ultimo
+                        punto misurato
+
+    Si usano solo gli ultimi punti perché la pendenza locale è quella che
+    conta per estrapolare (per n piccoli dominano i costi fissi).
+    """
+    if not ns:
+        return None
+
+    slope = SINGLE_POINT_SLOPE
+    if len(ns) >= 2:
+        fit = fit_loglog(ns[-history:], ts[-history:])
+        if fit is not None:
+            slope = max(fit["slope"], MIN_SLOPE)
+
+    n_last, t_last = ns[-1], ts[-1]
+    if n_last <= 0 or t_last <= 0:
+        return None
+    return t_last * math.exp(slope * (math.log(n) - math.log(n_last)))
+
+
+class BudgetScheduler:
+    """
+    Tiene traccia, per ogni configurazione, dei tempi misurati e delle
+    configurazioni censurate, e decide cosa eseguire.
+
+    Una configurazione è una chiave qualsiasi (in tests.py la coppia
+    (caso, implementazione)).
+    """
+
+    def __init__(self, budget, history=3):
+        """
+        budget:  secondi massimi previsti/misurati per una ripetizione
+        history: numero di misure recenti usate per la previsione
+        """
+        if budget <= 0:
+            raise ValueError("budget must be > 0")
+        self.budget = budget
+        self.history = history
+
+        # configurazione → (ns, tempi mediani per ripetizione)
+        self._ns = {}
+        self._ts = {}
+
+        # configurazioni escluse da qui in avanti → motivo della censura
+        # ("timeout" o "predicted")
+        self.censored = {}
+
+    def predict(self, config, n):
+        """Tempo previsto per una ripetizione di 'config' alla dimensione n."""
+        return predict_time(self._ns.get(config, []), self._ts.get(config, []),
+                            n, self.history)
+
+    def reliable(self, config, n):
+        """
+        True se la previsione per 'config' alla dimensione n è abbastanza
+        affidabile per saltare la configurazione: almeno due misure e n non
+        oltre MAX_EXTRAPOLATION volte l'ultimo n misurato.
+        """
+        ns = self._ns.get(config, [])
+        return len(ns) >= 2 and n <= MAX_EXTRAPOLATION * ns[-1]
+
+    def admit(self, config, n):
+        """
+        True se 'config' va eseguita alla dimensione n.
+        Se una previsione affidabile supera il budget la configurazione
+        viene censurata con motivo "predicted" (anche per tutti gli n
+        successivi, che costerebbero di più). Una previsione non affidabile
+        oltre il budget non basta: la configurazione viene eseguita sotto
+        il timer (run). Senza timer, come ripiego, viene saltata comunque.
+        """
+        if config in self.censored:
+            return False
+        predicted = self.predict(config, n)
+        if predicted is not None and predicted > self.budget:
+            if HAS_TIMER and not self.reliable(config, n):
+                return True
+            self.censored[config] = "predicted"
+            return False
+        return True
+
+    def order(self, configs, n):
+        """
+        Ordina le configurazioni dalla più economica prevista alla più
+        costosa; quelle senza previsione (mai misurate) vanno per prime.
+        """
+        def cost(config):
+            predicted = self.predict(config, n)
+            return -1.0 if predicted is None else predicted
+        return sorted(configs, key=cost)
+
+    def run(self):
+        """
+        Context manager per una ripetizione: la interrompe con RunTimeout
+        se supera il budget (vedi time_limit). Chi lo usa deve censurare
+        la configurazione con timeout().
+        """
+        return time_limit(self.budget)
+
+    def timeout(self, config):
+        """Censura 'config' dopo una ripetizione interrotta."""
+        self.censored[config] = "timeout"
+
+    def expired(self, config, seconds):
+        """
+        Da chiamare dopo ogni ripetizione: se ha superato il budget, la
+        configurazione va in timeout (censurata) e restituisce True.
+        Con il timer (HAS_TIMER) una ripetizione troppo lunga viene già
+        interrotta da run(); questo controllo resta come ripiego.
+        """
+        if seconds > self.budget:
+            self.censored[config] = "timeout"
+            return True
+        return False
+
+    def record(self, config, n, seconds):
+        """Registra il tempo (mediano) per ripetizione misurato a dimensione n."""
+        ns = self._ns.setdefault(config, [])
+        ts = self._ts.setdefault(config, [])
+        ns.append(n)
+        ts.append(seconds)
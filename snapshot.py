@@ -0,0 +1,113 @@
+# snapshot.py
+#
+# Formato binario per salvare (dump) e ripristinare (load) il contenuto
+# di una coda di priorità, ad esempio allo spegnimento e all'avvio.
+#
+# pickle sulle liste concatenate è lento (un oggetto per nodo) e, essendo
+# ricorsivo sul campo next, supera il limite di ricorsione con liste lunghe.
+# Qui invece il file contiene:
+#
+#   HEADER (24 byte, formato struct "<4sB1s1sxQQ"):
+#     magic      4 byte   b"PQSN"
+#     version    1 byte   VERSION
+#     byteorder  1 byte   b"<" (little endian) o b">" (big endian)
+#     typecode   1 byte   b"q" (interi a 64 bit) o b"d" (float a 64 bit)
+#     (padding)  1 byte
+#     count      8 byte   numero di chiavi
+#     extra      8 byte   parametro della struttura (es. capacity), o 0
+#   KEYS: 'count' chiavi contigue in un array tipizzato (array.array),
+#         nell'ordine interno della struttura (es. ordine di heap)
+#
+# Sono supportate solo le code in cui ogni item è la chiave stessa: un
+# payload arbitrario non si può rappresentare in un array tipizzato.
+# A parità di priorità le chiavi sono indistinguibili, quindi basta l'ordine
+# delle chiavi per ricostruire una coda equivalente.
+
+
+import sys
+import struct
+from array import array
+
+
+MAGIC = b"PQSN"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sB1s1sxQQ")
+_BYTEORDER = b"<" if sys.byteorder == "little" else b">"
+
+
+def check_keys_only(keys, items, keyfunc=None):
+    """
+    Solleva ValueError se la coda contiene payload (item diversi dalle
+    chiavi) o usa una funzione key: non sono rappresentabili nel formato.
+    Il confronto tra liste è eseguito in C (prima per identità, poi con ==).
+    """
+    if keyfunc is not None or keys != items:
+        raise ValueError("dump() supports only queues whose items are their keys")
+
+
+def _typed_array(keys):
+    """
+    Converte le chiavi in un array tipizzato: 'q' se sono tutte intere
+    (a 64 bit), 'd' se sono tutte float; altrimenti ValueError.
+    """
+    try:
+        return array("q", keys)
+    except (TypeError, OverflowError):
+        pass
+    if all(type(k) is float for k in keys):
+        return array("d", keys)
+    raise ValueError("dump() supports only int (64-bit) or float keys")
+
+
+def write_snapshot(fileobj, keys, extra=0):
+    """
+    Scrive header e chiavi su un file aperto in modalità binaria.
+    L'array viene scritto in un colpo solo (buffer protocol, senza copie).
+    """
+    arr = _typed_array(keys)
+    fileobj.write(_HEADER.pack(MAGIC, VERSION, _BYTEORDER,
+                               arr.typecode.encode("ascii"), len(arr), extra))
+    fileobj.write(arr)
+
+
+def read_snapshot(fileobj):
+    """
+    Legge un file scritto da write_snapshot e restituisce (keys, extra),
+    con keys lista Python.
+
+    Le chiavi vengono lette direttamente in un unico buffer (readinto) e
+    convertite in lista attraverso una memoryview tipizzata sul buffer.
+    Il ripristino NON è zero-copy: tolist crea un oggetto Python per
+    chiave, cioè una conversione in lista O(n) che è la parte principale
+    del costo di load. Serve comunque una lista, perché le code tengono
+    le chiavi (e gli item paralleli) in liste Python. Se il file è stato
+    scritto su una macchina con ordine dei byte diverso si passa da
+    array.byteswap.
+    """
+    header = fileobj.read(_HEADER.size)
+    if len(header) != _HEADER.size:
+        raise ValueError("truncated snapshot header")
+
+    magic, version, byteorder, typecode, count, extra = _HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("not a priority queue snapshot")
+    if version != VERSION:
+        raise ValueError("unsupported snapshot version %d" % version)
+
+    typecode = typecode.decode("ascii")
+    if typecode not in ("q", "d"):
+        raise ValueError("unsupported snapshot typecode %r" % typecode)
+
+    buf = bytearray(count * array(typecode).itemsize)
+    if fileobj.readinto(buf) != len(buf):
+        raise ValueError("truncated snapshot data")
+
+    if byteorder == _BYTEORDER:
+        keys = memoryview(buf).cast(typecode).tolist()
+    else:
+        arr = array(typecode)
+        arr.frombytes(buf)
+        arr.byteswap()
+        keys = arr.tolist()
+    return keys, extra
@@ -0,0 +1,127 @@
+# sorted_array_priority_queue.py
+#
+# Implementazione di una coda di priorità usando un ARRAY ORDINATO
+# (lista Python, memoria contigua).
+#
+# Le priorità sono mantenute in ordine CRESCENTE:
+#     data[-1] -> valore massimo
+# così extract_max è un semplice pop() dalla fine, senza spostamenti.
+#
+# Come negli heap, gli elementi stanno in due ARRAY PARALLELI:
+# - data[i]  = priorità (l'unico valore confrontato)
+# - items[i] = item associato (payload, mai confrontato)
+#
+# Rispetto alla lista concatenata ordinata, insert ha lo stesso costo
+# asintotico O(n), ma:
+# - la posizione si trova con una ricerca binaria (bisect, in C): O(log n)
+# - lo spostamento degli elementi successivi è una memmove in C,
+#   molto più veloce dello scorrimento dei nodi della lista in Python
+#
+# A parità di priorità il nuovo elemento va PRIMA di quelli già presenti
+# (bisect_left): l'elemento più vecchio resta più vicino alla fine ed esce
+# per primo → ordine FIFO. (bisect.insort inserirebbe dopo, cioè LIFO.)
+#
+# Complessità:
+#   insert      = O(log n) confronti + O(n) spostamenti (memmove)
+#   extract_max = O(1)
+#   peek        = O(1)
+#   remove      = O(n)
+#   from_keys   = O(n log n)
+#   dump / load = O(n)
+
+
+from bisect import bisect_left
+
+from priority_queue_base import PriorityQueue, _NO_ITEM
+from snapshot import check_keys_only, write_snapshot, read_snapshot
+
+
+class SortedArrayPriorityQueue(PriorityQueue):
+
+    def __init__(self, key=None):
+        super().__init__(key)
+        # Array paralleli ordinati per priorità crescente
+        self.data = []
+        self.items = []
+
+    def size(self):
+        """Restituisce il numero di elementi presenti nell'array."""
+        return len(self.data)
+
+    def peek(self):
+        """
+        Restituisce l'item massimo senza rimuoverlo.
+        Il massimo è sempre l'ultimo elemento. O(1)
+        """
+        if len(self.data) == 0:
+            raise IndexError("peek from empty sorted array")
+        return self.items[-1]
+
+    def insert(self, key, item=_NO_ITEM):
+        """
+        Inserisce un elemento mantenendo l'ordine crescente:
+        1. ricerca binaria della posizione (prima delle priorità uguali)
+        2. list.insert sposta in blocco gli elementi successivi
+        Complessità: O(log n) + O(n) memmove
+        """
+        key, item = self._entry(key, item)
+        i = bisect_left(self.data, key)
+        self.data.insert(i, key)
+        self.items.insert(i, item)
+
+    def extract_max(self):
+        """Rimuove e restituisce l'item massimo (l'ultimo). O(1)"""
+        if len(self.data) == 0:
+            raise IndexError("extract_max from empty sorted array")
+        self.data.pop()
+        return self.items.pop()
+
+    def remove(self, key_or_handle):
+        """
+        Rimuove l'elemento più prioritario il cui item è uguale alla chiave
+        (cioè il primo che extract_max restituirebbe).
+        Complessità: O(n) per la ricerca e lo spostamento
+        """
+        items = self.items
+        for i in range(len(items) - 1, -1, -1):
+            if items[i] == key_or_handle:
+                del self.data[i]
+                del items[i]
+                return
+        raise ValueError("item not in sorted array")
+
+    @classmethod
+    def from_keys(cls, keys, items=None):
+        """
+        Costruisce l'array ordinato in un colpo solo con sorted (in C).
+        L'ordinamento decrescente è stabile (a parità resta l'ordine di
+        inserimento); rovesciato, mette il più vecchio verso la fine.
+        Complessità: O(n log n)
+        """
+        pq = cls()
+        if items is None:
+            # Chiavi uguali sono indistinguibili: basta ordinarle
+            pq.data = sorted(keys)
+            pq.items = list(pq.data)
+        else:
+            keys = list(keys)
+            items = list(items)
+            order = sorted(range(len(keys)), key=keys.__getitem__, reverse=True)
+            order.reverse()
+            pq.data = [keys[i] for i in order]
+            pq.items = [items[i] for i in order]
+        return pq
+
+    def dump(self, fileobj):
+        """Salva l'array ordinato così com'è. O(n)"""
+        check_keys_only(self.data, self.items, self.keyfunc)
+        write_snapshot(fileobj, self.data)
+
+    @classmethod
+    def load(cls, fileobj):
+        """L'array salvato è già ordinato: viene adottato così com'è. O(n)"""
+        keys, _ = read_snapshot(fileobj)
+        pq = cls()
+        pq.data = keys
+        pq.items = list(keys)
+        return pq
@@ -9,34 +9,40 @@
 # - Insert: O(n) perché dobbiamo trovare la posizione corretta.
 # - Peek: O(1) il massimo è sempre in testa!
 # - Extract_max: O(1) rimuoviamo la testa.
+# - Remove: O(n) per trovare il nodo, poi lo si scollega direttamente
+#   (l'ordine resta valido). Il nodo restituito da insert fa da handle.
+# - Insert_many: O(n + m log m) per un blocco di m chiavi (ordinamento del
+#   blocco + una sola passata di fusione), invece di O(n·m) con m insert.
 #
 # Questa struttura è ottima se facciamo tante "extract_max" e relativamente
 # poche "insert", perché inserire è lento ma estrarre è velocissimo.
+#
+# A parità di priorità un nuovo nodo viene inserito DOPO quelli già presenti,
+# così gli elementi con la stessa priorità escono in ordine FIFO.
+#
+# I nodi (Node, con __slots__) sono definiti in linked_list_node.py; con un
+# NodePool i nodi estratti vengono riutilizzati dalle insert successive.
 
 
-from priority_queue_base import PriorityQueue
-
-
-class Node:
-    """
-    Nodo della lista concatenata.
-    - key  = valore memorizzato
-    - next = puntatore al prossimo nodo
-    """
-    def __init__(self, key, next=None):
-        self.key = key
-        self.next = next
+from priority_queue_base import PriorityQueue, _NO_ITEM
+from linked_list_node import Node
+from snapshot import check_keys_only, write_snapshot, read_snapshot
 
 
 class SortedLinkedListPriorityQueue(PriorityQueue):
 
-    def __init__(self):
+    def __init__(self, key=None, pool=None):
         """
         Inizializza una lista concatenata ordinata.
         head → nodo con valore massimo
+        key = funzione opzionale per calcolare la priorità
+        pool = NodePool opzionale da cui prendere (e a cui restituire) i nodi;
+               con un pool gli handle diventano invalidi dopo extract_max/remove
         """
+        super().__init__(key)
         self.head = None
         self.n = 0
+        self.pool = pool
 
     def size(self):
         """Restituisce il numero di elementi nella coda di priorità."""
@@ -44,7 +50,7 @@ class SortedLinkedListPriorityQueue(PriorityQueue):
 
     def peek(self):
         """
-        Restituisce il valore massimo senza rimuoverlo.
+        Restituisce l'item massimo senza rimuoverlo.
 
         Poiché la lista è ORDINATA in modo DECRESCENTE,
         il massimo è sempre il primo elemento.
@@ -53,9 +59,9 @@ class SortedLinkedListPriorityQueue(PriorityQueue):
         """
         if self.head is None:
             raise IndexError("peek from empty sorted list")
-        return self.head.key
+        return self.head.item
 
-    def insert(self, key):
+    def insert(self, key, item=_NO_ITEM):
         """
         Inserisce un valore mantenendo la lista ordinata in senso decrescente.
 
@@ -65,16 +71,22 @@ class SortedLinkedListPriorityQueue(PriorityQueue):
 
         Complessità: O(n)
         Perché nel caso peggiore dobbiamo scorrere tutta la lista.
+
+        Restituisce il nodo creato, utilizzabile come handle per remove.
         """
-        new_node = Node(key)
+        key, item = self._entry(key, item)
+        if self.pool is None:
+            new_node = Node(key, None, item)
+        else:
+            new_node = self.pool.acquire(key, None, item)
 
-        # Caso 1: lista vuota o key è >= del valore massimo
+        # Caso 1: lista vuota o key è > del valore massimo
         # → inserimento in testa O(1)
-        if self.head is None or key >= self.head.key:
+        if self.head is None or key > self.head.key:
             new_node.next = self.head
             self.head = new_node
             self.n += 1
-            return
+            return new_node
 
         # Caso 2: scorre la lista finché non trova la posizione corretta
         prev = self.head
@@ -82,8 +94,9 @@ class SortedLinkedListPriorityQueue(PriorityQueue):
 
         # Scorri finché:
         # - non finisce la lista
-        # - e il nodo corrente ha un valore > key (per mantenere ordine DECRESCENTE)
-        while current is not None and current.key > key:
+        # - e il nodo corrente ha un valore >= key (ordine DECRESCENTE,
+        #   e a parità il nuovo nodo va dopo quelli già presenti → FIFO)
+        while current is not None and current.key >= key:
             prev = current
             current = current.next
 
@@ -91,10 +104,71 @@ class SortedLinkedListPriorityQueue(PriorityQueue):
         prev.next = new_node
         new_node.next = current
         self.n += 1
+        return new_node
+
+    def insert_many(self, keys, items=None):
+        """
+        Inserisce un blocco di m chiavi con una FUSIONE (come nel merge sort):
+        1. ordina il blocco in senso decrescente (sorted, in C, stabile)
+        2. crea tutti i nuovi nodi in blocco (list comprehension)
+        3. scorre la lista UNA sola volta, intercalando i nuovi nodi
+
+        A parità di priorità i nodi già presenti restano prima di quelli
+        nuovi, e i nuovi restano nell'ordine del blocco → FIFO.
+
+        Complessità: O(m log m) + O(n + m), invece di O(n·m) con m insert.
+        """
+        keys = list(keys)
+        if len(keys) == 1:
+            # un solo elemento: insert scorre la lista con meno lavoro per nodo
+            if items is None:
+                self.insert(keys[0])
+            else:
+                self.insert(keys[0], list(items)[0])
+            return
+        if self.keyfunc is not None:
+            if items is not None:
+                raise TypeError("insert_many() takes no items when key= is set")
+            items = keys
+            keys = [self.keyfunc(k) for k in keys]
+        if not keys:
+            return
+
+        new = Node if self.pool is None else self.pool.acquire
+        if items is None:
+            # sorted con reverse=True resta stabile: a parità, ordine del blocco
+            nodes = [new(k) for k in sorted(keys, reverse=True)]
+        else:
+            items = list(items)
+            order = sorted(range(len(keys)), key=keys.__getitem__, reverse=True)
+            nodes = [new(keys[i], None, items[i]) for i in order]
+
+        # Fusione: 'rest' è la parte della lista non ancora visitata,
+        # 'tail' l'ultimo nodo già sistemato (None = nessuno, si parte da head)
+        rest = self.head
+        tail = None
+        for node in nodes:
+            # i nodi esistenti con chiave >= vanno prima (FIFO)
+            while rest is not None and rest.key >= node.key:
+                if tail is None:
+                    self.head = rest
+                else:
+                    tail.next = rest
+                tail = rest
+                rest = rest.next
+
+            if tail is None:
+                self.head = node
+            else:
+                tail.next = node
+            tail = node
+
+        tail.next = rest
+        self.n += len(nodes)
 
     def extract_max(self):
         """
-        Rimuove e restituisce il massimo dalla lista.
+        Rimuove e restituisce l'item massimo dalla lista.
 
         Poiché la lista è in ordine DECRESCENTE, il massimo
         si trova SEMPRE in testa → O(1)
@@ -104,7 +178,102 @@ class SortedLinkedListPriorityQueue(PriorityQueue):
         if self.head is None:
             raise IndexError("extract_max from empty sorted list")
 
-        max_val = self.head.key
-        self.head = self.head.next
+        head = self.head
+        max_item = head.item
+        self.head = head.next
         self.n -= 1
-        return max_val
+        if self.pool is not None:
+            self.pool.release(head)
+        return max_item
+
+    def remove(self, key_or_handle):
+        """
+        Rimuove un nodo dalla lista:
+        - se riceve un Node (restituito da insert), rimuove proprio quel nodo
+        - altrimenti rimuove il primo nodo il cui item è uguale alla chiave
+
+        Una sola passata trova il nodo e il suo predecessore,
+        poi il nodo viene scollegato direttamente.
+        Complessità: O(n)
+        """
+        by_handle = isinstance(key_or_handle, Node)
+
+        prev = None
+        current = self.head
+        while current is not None:
+            if (current is key_or_handle) if by_handle else (current.item == key_or_handle):
+                if prev is None:
+                    self.head = current.next
+                else:
+                    prev.next = current.next
+                self.n -= 1
+                if self.pool is not None:
+                    self.pool.release(current)
+                return
+            prev = current
+            current = current.next
+
+        raise ValueError("item not in sorted list")
+
+    @classmethod
+    def from_keys(cls, keys, items=None):
+        """
+        Costruisce la lista ordinata in un colpo solo:
+        1. ordina le chiavi in senso decrescente (sorted, in C); l'ordinamento
+           è stabile, quindi a parità resta l'ordine di inserimento
+        2. crea i nodi partendo dall'ultimo e inserendoli in testa, così la
+           testa finisce per contenere il massimo
+
+        Complessità: O(n log n) per l'ordinamento + O(n) per i nodi,
+        invece di O(n²) con n insert.
+        """
+        pq = cls()
+        head = None
+        n = 0
+        if items is None:
+            # Chiavi uguali sono indistinguibili: basta ordinarle
+            for k in sorted(keys):
+                head = Node(k, head)
+                n += 1
+        else:
+            keys = list(keys)
+            items = list(items)
+            order = sorted(range(len(keys)), key=keys.__getitem__, reverse=True)
+            for i in reversed(order):
+                head = Node(keys[i], head, items[i])
+                n += 1
+        pq.head = head
+        pq.n = n
+        return pq
+
+    def dump(self, fileobj):
+        """
+        Salva le chiavi nell'ordine della lista (decrescente).
+        Complessità: O(n)
+        """
+        keys = []
+        items = []
+        current = self.head
+        while current is not None:
+            keys.append(current.key)
+            items.append(current.item)
+            current = current.next
+        check_keys_only(keys, items, self.keyfunc)
+        write_snapshot(fileobj, keys)
+
+    @classmethod
+    def load(cls, fileobj):
+        """
+        Le chiavi sono già in ordine decrescente: la lista viene ricostruita
+        in una sola passata lineare, dall'ultima chiave alla prima
+        (inserimento in testa), senza ordinare.
+        Complessità: O(n)
+        """
+        keys, _ = read_snapshot(fileobj)
+        pq = cls()
+        head = None
+        for k in reversed(keys):
+            head = Node(k, head)
+        pq.head = head
+        pq.n = len(keys)
+        return pq
@@ -0,0 +1,200 @@
+# stdlib_priority_queues.py
+#
+# Adattatori che espongono le code di priorità della libreria standard
+# con l'interfaccia PriorityQueue, da usare come RIFERIMENTO (baseline)
+# nei confronti con le implementazioni scritte a mano:
+#
+#  - HeapqPriorityQueue : modulo heapq (min-heap implementato in C)
+#  - QueuePriorityQueue : queue.PriorityQueue (heapq + lock, thread-safe)
+#
+# Entrambe le strutture sono dei MIN-heap: per ottenere il massimo si
+# memorizzano tuple (-priorità, seq, item):
+# - la priorità negata trasforma il minimo nel massimo (quindi le priorità
+#   devono essere numeriche)
+# - seq (numero progressivo di inserimento) risolve la parità in ordine
+#   FIFO e fa sì che l'item non venga mai confrontato
+#
+# Complessità (come HeapPriorityQueue):
+#   insert      = O(log n)
+#   extract_max = O(log n)
+#   peek        = O(1)
+#   remove      = O(n)   (ricerca + heapify)
+#   from_keys   = O(n)
+#   dump / load = O(n)   (l'heap viene salvato e adottato così com'è)
+
+
+import heapq
+import queue
+
+from priority_queue_base import PriorityQueue, _NO_ITEM
+from snapshot import check_keys_only, write_snapshot, read_snapshot
+
+
+def _tuples(keys, items):
+    """Tuple (-priorità, seq, item) per una costruzione in blocco."""
+    keys = list(keys)
+    if items is None:
+        items = keys
+    return [(-k, seq, it) for seq, (k, it) in enumerate(zip(keys, items))]
+
+
+def _dump_entries(fileobj, heap, keyfunc):
+    """Salva le priorità di una lista-heap di tuple, in ordine di heap."""
+    keys = [-entry[0] for entry in heap]
+    check_keys_only(keys, [entry[2] for entry in heap], keyfunc)
+    write_snapshot(fileobj, keys)
+
+
+def _load_entries(fileobj):
+    """
+    Legge le priorità salvate da _dump_entries e ricostruisce le tuple.
+    L'ordine di heap resta valido usando gli indici come seq (a parità
+    di priorità il padre ha indice minore): nessun heapify.
+    """
+    keys, _ = read_snapshot(fileobj)
+    return [(-k, seq, k) for seq, k in enumerate(keys)]
+
+
+def _remove_entry(heap, item):
+    """
+    Rimuove dalla lista-heap la prima tupla con questo item e ripristina
+    l'heap con heapify. Restituisce False se l'item non è presente.
+    """
+    for i, entry in enumerate(heap):
+        if entry[2] == item:
+            heap[i] = heap[-1]
+            heap.pop()
+            heapq.heapify(heap)
+            return True
+    return False
+
+
+class HeapqPriorityQueue(PriorityQueue):
+
+    def __init__(self, key=None):
+        super().__init__(key)
+        # Lista gestita dalle funzioni di heapq
+        self.heap = []
+        self._seq = 0
+
+    def size(self):
+        """Restituisce il numero di elementi presenti."""
+        return len(self.heap)
+
+    def peek(self):
+        """Restituisce l'item massimo (la radice del min-heap). O(1)"""
+        if len(self.heap) == 0:
+            raise IndexError("peek from empty heapq queue")
+        return self.heap[0][2]
+
+    def insert(self, key, item=_NO_ITEM):
+        """Inserisce (-priorità, seq, item) con heappush. O(log n)"""
+        key, item = self._entry(key, item)
+        heapq.heappush(self.heap, (-key, self._seq, item))
+        self._seq += 1
+
+    def extract_max(self):
+        """Rimuove e restituisce l'item massimo con heappop. O(log n)"""
+        if len(self.heap) == 0:
+            raise IndexError("extract_max from empty heapq queue")
+        return heapq.heappop(self.heap)[2]
+
+    def remove(self, key_or_handle):
+        """Rimuove un elemento il cui item è uguale alla chiave. O(n)"""
+        if not _remove_entry(self.heap, key_or_handle):
+            raise ValueError("item not in heapq queue")
+
+    @classmethod
+    def from_keys(cls, keys, items=None):
+        """Costruzione in blocco con heapq.heapify. O(n)"""
+        pq = cls()
+        pq.heap = _tuples(keys, items)
+        pq._seq = len(pq.heap)
+        heapq.heapify(pq.heap)
+        return pq
+
+    def dump(self, fileobj):
+        """Salva le priorità in ordine di heap. O(n)"""
+        _dump_entries(fileobj, self.heap, self.keyfunc)
+
+    @classmethod
+    def load(cls, fileobj):
+        """Adotta l'heap salvato così com'è. O(n)"""
+        pq = cls()
+        pq.heap = _load_entries(fileobj)
+        pq._seq = len(pq.heap)
+        return pq
+
+
+class QueuePriorityQueue(PriorityQueue):
+    """
+    queue.PriorityQueue è pensata per lo scambio di dati tra thread:
+    ogni operazione acquisisce un lock e gestisce le condition variable.
+    Qui si usano sempre le varianti non bloccanti (put_nowait/get_nowait),
+    così il confronto con HeapqPriorityQueue misura proprio questo costo.
+    """
+
+    def __init__(self, key=None):
+        super().__init__(key)
+        self.queue = queue.PriorityQueue()
+        self._seq = 0
+
+    def size(self):
+        """Restituisce il numero di elementi presenti."""
+        return self.queue.qsize()
+
+    def peek(self):
+        """
+        Restituisce l'item massimo senza rimuoverlo: queue.PriorityQueue
+        non ha peek, si legge la radice della lista interna sotto lock.
+        """
+        with self.queue.mutex:
+            if len(self.queue.queue) == 0:
+                raise IndexError("peek from empty queue.PriorityQueue")
+            return self.queue.queue[0][2]
+
+    def insert(self, key, item=_NO_ITEM):
+        """Inserisce (-priorità, seq, item) con put_nowait. O(log n)"""
+        key, item = self._entry(key, item)
+        self.queue.put_nowait((-key, self._seq, item))
+        self._seq += 1
+
+    def extract_max(self):
+        """Rimuove e restituisce l'item massimo con get_nowait. O(log n)"""
+        try:
+            return self.queue.get_nowait()[2]
+        except queue.Empty:
+            raise IndexError("extract_max from empty queue.PriorityQueue") from None
+
+    def remove(self, key_or_handle):
+        """
+        Rimuove un elemento il cui item è uguale alla chiave, operando
+        sulla lista interna sotto lock. O(n)
+        """
+        with self.queue.mutex:
+            found = _remove_entry(self.queue.queue, key_or_handle)
+        if not found:
+            raise ValueError("item not in queue.PriorityQueue")
+
+    @classmethod
+    def from_keys(cls, keys, items=None):
+        """Costruzione in blocco: heapify sulla lista interna. O(n)"""
+        pq = cls()
+        entries = _tuples(keys, items)
+        heapq.heapify(entries)
+        pq.queue.queue = entries
+        pq._seq = len(entries)
+        return pq
+
+    def dump(self, fileobj):
+        """Salva le priorità in ordine di heap, sotto lock. O(n)"""
+        with self.queue.mutex:
+            _dump_entries(fileobj, self.queue.queue, self.keyfunc)
+
+    @classmethod
+    def load(cls, fileobj):
+        """Adotta l'heap salvato così com'è. O(n)"""
+        pq = cls()
+        pq.queue.queue = _load_entries(fileobj)
+        pq._seq = len(pq.queue.queue)
+        return pq
@@ -1,23 +1,38 @@
 # tests.py
 #
-# Questo script esegue TEST DI PERFORMANCE sulle tre implementazioni
+# Questo script esegue TEST DI PERFORMANCE sulle implementazioni
 # delle code di priorità:
 #
 #  - HeapPriorityQueue
 #  - LinkedListPriorityQueue
 #  - SortedLinkedListPriorityQueue
+#  - MinMaxHeapPriorityQueue
+#  - SortedArrayPriorityQueue
+#  - PersistentPriorityQueue
+#  - CalendarPriorityQueue
+#
+# e, come riferimento, le code della libreria standard:
+#
+#  - HeapqPriorityQueue  (heapq)
+#  - QueuePriorityQueue  (queue.PriorityQueue)
 #
 # Genera i file CSV:
 #   - raw_results.csv        → risultati grezzi, run per run
 #   - aggregated_results.csv → tempi aggregati (mediana, media, stdev)
 #
+# Con --budget le configurazioni troppo lente vengono saltate o interrotte
+# (scheduler.py) e compaiono nei CSV con censored = True, tempi vuoti e il
+# motivo in censor_reason ("timeout", "predicted" o "inherited").
+#
 # Serve come base per generare grafici e tabelle nella relazione LaTeX.
 
 
 import os
 import csv
+import time
 import argparse
 from collections import defaultdict
+from contextlib import nullcontext
 
 from utils import (
     generate_input,
@@ -26,10 +41,16 @@ from utils import (
     verify_extract_sequence
 )
 
-# Importiamo le implementazioni delle tre priority queue
+# Importiamo le implementazioni delle priority queue
 from heap_priority_queue import HeapPriorityQueue
 from linked_list_priority_queue import LinkedListPriorityQueue
 from sorted_linked_list_priority_queue import SortedLinkedListPriorityQueue
+from min_max_heap_priority_queue import MinMaxHeapPriorityQueue
+from sorted_array_priority_queue import SortedArrayPriorityQueue
+from persistent_priority_queue import PersistentPriorityQueue
+from calendar_priority_queue import CalendarPriorityQueue
+from stdlib_priority_queues import HeapqPriorityQueue, QueuePriorityQueue
+from scheduler import BudgetScheduler, RunTimeout
 
 
 def get_impls():
@@ -41,7 +62,14 @@ def get_impls():
     return {
         "heap": HeapPriorityQueue,
         "linked_list": LinkedListPriorityQueue,
-        "sorted_linked_list": SortedLinkedListPriorityQueue
+        "sorted_linked_list": SortedLinkedListPriorityQueue,
+        "min_max_heap": MinMaxHeapPriorityQueue,
+        "sorted_array": SortedArrayPriorityQueue,
+        "persistent": PersistentPriorityQueue,
+        "calendar": CalendarPriorityQueue,
+        # baseline della libreria standard
+        "heapq": HeapqPriorityQueue,
+        "queue": QueuePriorityQueue
     }
 
 
@@ -115,7 +143,8 @@ def main(out_dir="results",
          ns=(100, 500, 1000, 5000),
          cases=("random", "ascending", "descending", "repeated"),
          runs=5,
-         random_range=None):
+         random_range=None,
+         budget=None):
     """
     Funzione principale che esegue TUTTI i test.
 
@@ -125,12 +154,17 @@ def main(out_dir="results",
     - cases: tipi di input da testare
     - runs: ripetizioni per ogni configurazione
     - random_range: range numerico per il caso "random"
+    - budget: secondi massimi per una ripetizione di una configurazione
+              (caso, implementazione); None = nessun limite.
+              Vedi scheduler.py: le configurazioni che supererebbero il
+              budget vengono saltate, una ripetizione che lo supera viene
+              interrotta; entrambe sono registrate come censurate.
 
     Strategia di test:
-      Per ogni n
-        Per ogni tipo di input (case)
-          Per ogni implementazione
-            Per ogni run (ripetizione)
+      Per ogni n (in ordine crescente)
+        Per ogni configurazione (tipo di input, implementazione);
+        con un budget, dalla più economica prevista
+          Per ogni run (ripetizione)
               - genera input
               - misura tempo insert
               - verifica correttezza (estrazione completa)
@@ -144,6 +178,12 @@ def main(out_dir="results",
     agg_path = os.path.join(out_dir, "aggregated_results.csv")
 
     impls = get_impls()
+    scheduler = None if budget is None else BudgetScheduler(budget)
+
+    # Struttura che accumula i tempi per l’aggregazione
+    agg_storage = defaultdict(list)
+    # Configurazioni saltate perché oltre il budget: (impl, n, case, motivo)
+    censored_rows = []
 
     # Apriamo il file CSV RAW: un record per ogni run
     with open(raw_path, "w", newline="") as raw_file:
@@ -152,66 +192,131 @@ def main(out_dir="results",
         # Header CSV
         raw_writer.writerow([
             "impl", "operation", "n", "case",
-            "run_id", "time_seconds", "valid"
+            "run_id", "time_seconds", "valid", "censored", "censor_reason"
         ])
 
-        # Struttura che accumula i tempi per l’aggregazione
-        agg_storage = defaultdict(list)
-
         run_id = 0
 
-        # Triple loop su ns, cases, implementazioni
-        for n in ns:
-            for case in cases:
-                for impl_name, impl_cls in impls.items():
-
-                    for run_idx in range(runs):
-
-                        run_id += 1
-                        seed = run_idx  # per garantire riproducibilità parziale
-
-                        # --- GENERAZIONE INPUT ---
-                        keys = generate_input(
-                            n,
-                            case=case,
-                            random_range=random_range,
-                            seed=seed
-                        )
-
-                        # --- TEST INSERT ---
-                        t_insert, pq_instance = run_insert_test(impl_cls, keys)
-
-                        # Verifica della correttezza:
-                        # estrai tutti gli elementi da una NUOVA PQ basata sugli stessi keys
-                        _, extracted = run_extract_test(impl_cls, keys)
-                        valid = verify_extract_sequence(keys, extracted)
-
-                        # Scriviamo riga dei RAW data
+        for n in sorted(ns):
+            configs = [(case, impl_name) for case in cases for impl_name in impls]
+            if scheduler is not None:
+                configs = scheduler.order(configs, n)
+
+            for config in configs:
+                case, impl_name = config
+                impl_cls = impls[impl_name]
+
+                # Già censurata a un n più piccolo, oppure censurata ora
+                # per una previsione affidabile oltre il budget
+                reason = None
+                if scheduler is not None:
+                    if config in scheduler.censored:
+                        reason = "inherited"
+                    elif not scheduler.admit(config, n):
+                        reason = "predicted"
+
+                if reason is not None:
+                    censored_rows.append((impl_name, n, case, reason))
+                    for operation in ("insert", "extract_all"):
                         raw_writer.writerow([
-                            impl_name, "insert", n, case,
-                            run_id, t_insert, valid
+                            impl_name, operation, n, case,
+                            "", "", "", True, reason
                         ])
-
-                        # Salviamo per l’aggregazione
-                        agg_storage[(impl_name, "insert", n, case)].append(t_insert)
-
-                        # --- TEST EXTRACT (solo tempo di estrazione) ---
-                        t_extract, extracted2 = run_extract_test(impl_cls, keys)
-                        valid2 = verify_extract_sequence(keys, extracted2)
-
+                    if reason == "inherited":
+                        detail = "censored at a smaller n"
+                    else:
+                        predicted = scheduler.predict(config, n)
+                        detail = f"predicted={predicted:.3f}s > budget={budget}s"
+                    print(f"[skip] impl={impl_name} n={n} case={case} {detail}")
+                    continue
+
+                run_times = []
+                interrupted = False
+
+                for run_idx in range(runs):
+
+                    run_id += 1
+                    seed = run_idx  # per garantire riproducibilità parziale
+                    start = time.perf_counter()
+
+                    # Con un budget la ripetizione viene interrotta
+                    # (RunTimeout) appena lo supera: le righe vengono
+                    # scritte solo a ripetizione completata
+                    try:
+                        with nullcontext() if scheduler is None else scheduler.run():
+                            # --- GENERAZIONE INPUT ---
+                            keys = generate_input(
+                                n,
+                                case=case,
+                                random_range=random_range,
+                                seed=seed
+                            )
+
+                            # --- TEST INSERT ---
+                            t_insert, pq_instance = run_insert_test(impl_cls, keys)
+
+                            # Verifica della correttezza:
+                            # estrai tutti gli elementi da una NUOVA PQ basata sugli stessi keys
+                            _, extracted = run_extract_test(impl_cls, keys)
+                            valid = verify_extract_sequence(keys, extracted)
+
+                            # --- TEST EXTRACT (solo tempo di estrazione) ---
+                            t_extract, extracted2 = run_extract_test(impl_cls, keys)
+                            valid2 = verify_extract_sequence(keys, extracted2)
+                    except RunTimeout:
+                        interrupted = True
+                        scheduler.timeout(config)
+                        print(f"[timeout] impl={impl_name} n={n} case={case} "
+                              f"run={run_idx+1}/{runs} interrupted after "
+                              f"{time.perf_counter() - start:.3f}s > budget={budget}s")
+                        break
+
+                    # Scriviamo le righe dei RAW data
+                    raw_writer.writerow([
+                        impl_name, "insert", n, case,
+                        run_id, t_insert, valid, False, ""
+                    ])
+                    raw_writer.writerow([
+                        impl_name, "extract_all", n, case,
+                        run_id, t_extract, valid2, False, ""
+                    ])
+
+                    # Salviamo per l’aggregazione
+                    agg_storage[(impl_name, "insert", n, case)].append(t_insert)
+                    agg_storage[(impl_name, "extract_all", n, case)].append(t_extract)
+
+                    run_times.append(time.perf_counter() - start)
+
+                    # Log su console (utile quando i test sono lunghi)
+                    print(
+                        f"[run {run_id}] impl={impl_name} n={n} case={case} "
+                        f"run={run_idx+1}/{runs} insert={t_insert:.6f}s "
+                        f"extract={t_extract:.6f}s valid={valid and valid2}"
+                    )
+
+                    # Ripiego senza timer: le ripetizioni rimanenti (e gli
+                    # n successivi) costerebbero almeno altrettanto
+                    if scheduler is not None and scheduler.expired(config, run_times[-1]):
+                        print(f"[timeout] impl={impl_name} n={n} case={case} "
+                              f"run took {run_times[-1]:.3f}s > budget={budget}s")
+                        break
+
+                if interrupted:
+                    # La ripetizione interrotta è censurata; le ripetizioni
+                    # completate restano nei dati grezzi, ma la loro mediana
+                    # sottostimerebbe il tempo a questo n: anche la riga
+                    # aggregata è censurata
+                    for operation in ("insert", "extract_all"):
                         raw_writer.writerow([
-                            impl_name, "extract_all", n, case,
-                            run_id, t_extract, valid2
+                            impl_name, operation, n, case,
+                            run_id, "", "", True, "timeout"
                         ])
+                        agg_storage.pop((impl_name, operation, n, case), None)
+                    censored_rows.append((impl_name, n, case, "timeout"))
+                    continue
 
-                        agg_storage[(impl_name, "extract_all", n, case)].append(t_extract)
-
-                        # Log su console (utile quando i test sono lunghi)
-                        print(
-                            f"[run {run_id}] impl={impl_name} n={n} case={case} "
-                            f"run={run_idx+1}/{runs} insert={t_insert:.6f}s "
-                            f"extract={t_extract:.6f}s valid={valid and valid2}"
-                        )
+                if scheduler is not None:
+                    scheduler.record(config, n, aggregate_times(run_times)["median"])
 
     # --- PHASE 2: AGGREGAZIONE DEI RISULTATI ---
     with open(agg_path, "w", newline="") as agg_file:
@@ -219,7 +324,8 @@ def main(out_dir="results",
 
         agg_writer.writerow([
             "impl", "operation", "n", "case",
-            "median_s", "mean_s", "stdev_s", "count"
+            "median_s", "mean_s", "stdev_s", "count", "censored",
+            "censor_reason"
         ])
 
         for key, times in agg_storage.items():
@@ -235,9 +341,18 @@ def main(out_dir="results",
                 stats["median"],
                 stats["mean"],
                 stats["stdev"],
-                stats["count"]
+                stats["count"],
+                False,
+                ""
             ])
 
+        # Le configurazioni censurate non hanno tempi: si sa solo che
+        # avrebbero superato il budget
+        for impl_name, n, case, reason in censored_rows:
+            for operation in ("insert", "extract_all"):
+                agg_writer.writerow([impl_name, operation, n, case,
+                                     "", "", "", 0, True, reason])
+
     print("Raw results saved to:", raw_path)
     print("Aggregated results saved to:", agg_path)
 
@@ -255,10 +370,13 @@ if __name__ == "__main__":
     parser.add_argument("--cases", type=str, default="random,ascending,descending,repeated",
                         help="comma-separated case types")
     parser.add_argument("--random_range", type=int, default=None, help="range for random generator")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="max seconds per run of a configuration (skip/censor beyond)")
 
     args = parser.parse_args()
 
     ns = tuple(int(x) for x in args.ns.split(",") if x.strip())
     cases = tuple(x.strip() for x in args.cases.split(",") if x.strip())
 
-    main(out_dir=args.out, ns=ns, cases=cases, runs=args.runs, random_range=args.random_range)
+    main(out_dir=args.out, ns=ns, cases=cases, runs=args.runs,
+         random_range=args.random_range, budget=args.budget)
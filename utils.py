@@ -4,8 +4,10 @@
 # dai programmi di test e dagli script di misurazione.
 #
 # Include:
-# - generazione di input per gli esperimenti (varie forme)
+# - generazione di input per gli esperimenti (varie forme),
+#   anche a blocchi (stream) senza materializzare tutte le chiavi
 # - misurazione dei tempi di esecuzione di funzioni
+# - misurazione del picco di memoria allocata da una funzione
 # - aggregazione delle statistiche sui tempi
 # - verifica della correttezza delle estrazioni (max-first)
 
@@ -13,6 +15,7 @@
 import random
 import time
 import statistics
+import tracemalloc
 
 
 def generate_input(n, case='random', random_range=None, seed=None):
@@ -66,6 +69,42 @@ def generate_input(n, case='random', random_range=None, seed=None):
         raise ValueError("case must be one of 'random','ascending','descending','repeated'")
 
 
+def iter_input(n, case='random', random_range=None, seed=None, chunk_size=65536):
+    """
+    Versione "stream" di generate_input: produce le stesse 'n' chiavi
+    (a parità di parametri e seed) ma a blocchi di al più 'chunk_size'
+    elementi, senza tenere in memoria tutta la sequenza.
+
+    Utile per esperimenti con n molto grande (es. code limitate top-K),
+    dove la memoria occupata dall'input falserebbe le misure.
+
+    Complessità: O(n) in tempo, O(chunk_size) in memoria
+    """
+
+    if case not in ('random', 'ascending', 'descending', 'repeated'):
+        raise ValueError("case must be one of 'random','ascending','descending','repeated'")
+
+    # Stessa inizializzazione di generate_input
+    if seed is not None:
+        random.seed(seed)
+
+    if case == 'random' and random_range is None:
+        random_range = max(1000, n * 10)
+    r = max(2, min(10, n // 10))
+
+    for start in range(0, n, chunk_size):
+        stop = min(n, start + chunk_size)
+
+        if case == 'random':
+            yield [random.randint(0, random_range - 1) for _ in range(stop - start)]
+        elif case == 'ascending':
+            yield list(range(start, stop))
+        elif case == 'descending':
+            yield list(range(n - 1 - start, n - 1 - stop, -1))
+        else:
+            yield [random.randint(0, r - 1) for _ in range(stop - start)]
+
+
 def time_function(func, *args, **kwargs):
     """
     Misura il tempo di esecuzione di una funzione.
@@ -91,6 +130,28 @@ def time_function(func, *args, **kwargs):
     return end - start, result
 
 
+def peak_memory(func, *args, **kwargs):
+    """
+    Misura il picco di memoria allocata durante l'esecuzione di una funzione.
+
+    Restituisce:
+        (picco_in_byte, valore_restituito)
+
+    Usa tracemalloc, che conta solo le allocazioni fatte da Python
+    dopo l'avvio della misura. tracemalloc rallenta molto l'esecuzione:
+    non va usato insieme a time_function sulla stessa chiamata.
+    """
+
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak, result
+
+
 def aggregate_times(times):
     """
     Aggrega una lista di tempi (float) e restituisce: